@@ -31,6 +31,9 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
+    # daphne phải đứng đầu: `manage.py runserver` chạy ASGI (pip install -r requirements.txt)
+    # để /chat/ dùng chung một event loop, OpenAI client và stream được SSE
+    "daphne",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -70,6 +73,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "HocTiengTrungPJ.wsgi.application"
+ASGI_APPLICATION = "HocTiengTrungPJ.asgi.application"
 
 
 # Database
@@ -79,6 +83,10 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # WAL: nhiều reader đọc song song với một writer
+        "OPTIONS": {
+            "init_command": "PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL;",
+        },
     }
 }
 
@@ -118,3 +126,27 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = "static/"
+
+
+# Logging
+# https://docs.djangoproject.com/en/6.0/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "home": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+        "translator": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+    },
+}
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import StudySession, Vocabulary
+from .models import StudySession, Vocabulary, VocabImportJob
 
 
 @admin.register(StudySession)
@@ -19,3 +19,23 @@ class VocabularyAdmin(admin.ModelAdmin):
     date_hierarchy = "learned_date"
     ordering = ["-learned_date"]
     list_editable = ["mastery_level"]
+    # JOIN sẵn buổi học để tránh N+1 query khi cột nào đó dùng session
+    list_select_related = ["session"]
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Trang danh sách chỉ lấy các cột hiển thị, bỏ qua example_sentence
+        # (TextField); trang sửa cần đủ field nên giữ nguyên
+        # session phải được giữ lại vì đang dùng select_related
+        match = request.resolver_match
+        if match and match.url_name.endswith("changelist"):
+            queryset = queryset.only(*self.list_display, "session")
+        return queryset
+
+
+@admin.register(VocabImportJob)
+class VocabImportJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "status", "added_count", "created_at", "completed_at"]
+    list_filter = ["status"]
+    readonly_fields = ["batch_id", "added_count", "error", "completed_at"]
+    ordering = ["-created_at"]
@@ -0,0 +1,67 @@
+"""
+Bộ nhớ đệm bền vững cho kết quả tra từ
+Lưu JSON kết quả theo khóa SHA-256 của (model, input, phiên bản prompt)
+"""
+
+import json
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Optional, Any
+
+from django.utils import timezone
+
+from . import semantic_cache
+from .models import AICache
+
+
+logger = logging.getLogger(__name__)
+
+# Tăng khi đổi prompt để bỏ qua các kết quả cũ
+PROMPT_VERSION = "v2"
+
+# Thời gian sống của một kết quả
+CACHE_TTL = timedelta(days=30)
+
+
+def make_key(*parts: Optional[str]) -> str:
+    """Tạo khóa cache từ các thành phần (None được coi là chuỗi rỗng)"""
+    raw = "|".join(part or "" for part in (*parts, PROMPT_VERSION))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def lookup(key: str) -> Optional[Any]:
+    """Lấy kết quả từ cache, trả về None nếu không có hoặc đã hết hạn"""
+    try:
+        entry = AICache.objects.filter(
+            key=key, created_at__gte=timezone.now() - CACHE_TTL
+        ).first()
+    except Exception as e:
+        logger.error("✗ Cache read error: %s", e)
+        return None
+
+    return json.loads(entry.response) if entry else None
+
+
+def store(key: str, value: Any, embedding: Optional[bytes] = None) -> None:
+    """Lưu kết quả vào cache (ghi đè nếu đã có)"""
+    try:
+        AICache.objects.update_or_create(
+            key=key,
+            defaults={
+                "response": json.dumps(value, ensure_ascii=False),
+                "embedding": embedding,
+                "created_at": timezone.now(),
+            },
+        )
+    except Exception as e:
+        logger.error("✗ Cache write error: %s", e)
+
+
+def purge_expired() -> int:
+    """Xóa các kết quả đã hết hạn, trả về số bản ghi đã xóa"""
+    expired = AICache.objects.filter(created_at__lt=timezone.now() - CACHE_TTL)
+    keys = list(expired.exclude(embedding=None).values_list("key", flat=True))
+    deleted, _ = expired.delete()
+    semantic_cache.semantic_index.remove(keys)
+    return deleted
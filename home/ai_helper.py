@@ -4,25 +4,92 @@ Cung cấp dịch thuật và tự động điền thông tin từ vựng với
 """
 
 import os
+import re
 import json
+import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any, Union
+from functools import lru_cache
+from typing import Optional, Dict, Any, Union, List, Tuple, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
-from openai import OpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+from . import ai_cache, semantic_cache
+
+try:
+    import h2  # noqa: F401 - httpx cần h2 để dùng HTTP/2
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # pypinyin là tùy chọn, thiếu thì luôn hỏi AI
+    lazy_pinyin = None
+
+# Lỗi tạm thời (mạng, timeout, rate limit) mới đáng thử lại
+_TRANSIENT_ERRORS: Tuple[type, ...] = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TransportError,
+)
+
+# Chọn thư viện Google Translate một lần khi import: ưu tiên deep-translator
+try:
+    import requests
+    from deep_translator import GoogleTranslator as DeepGoogleTranslator
+    from deep_translator.exceptions import RequestError, TooManyRequests
+
+    _TRANSLATE_BACKEND = "deep-translator"
+    _TRANSIENT_ERRORS += (
+        requests.ConnectionError,
+        requests.Timeout,
+        RequestError,
+        TooManyRequests,
+    )
+except ImportError:
+    try:
+        from googletrans import Translator
+
+        _TRANSLATE_BACKEND = "googletrans"
+    except ImportError:
+        _TRANSLATE_BACKEND = None
 
 
-# Cấu hình logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Số từ tối đa gộp vào một request OpenAI
+MANY_CHUNK_SIZE = 20
+
+# Markdown code block (```json ... ```) bao quanh JSON
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+# Số lần thử lại khi gặp lỗi tạm thời (429, timeout, 5xx...)
+MAX_RETRIES = 3
+
+# Số kết nối keep-alive giữ lại trong pool tới OpenAI
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Mẫu JSON của một từ vựng mà AI phải trả về
+VOCABULARY_JSON_EXAMPLE = """{
+    "chinese": "从",
+    "pinyin": "cóng",
+    "vietnamese": "từ, theo",
+    "example": "我从学校来。(Wǒ cóng xuéxiào lái.) - Tôi đến từ trường học."
+}"""
+
+
 class TranslationMethod(Enum):
     """Phương thức dịch"""
 
     OPENAI = "AI (OpenAI)"
     GOOGLE = "Google Translate"
     FALLBACK = "Google Translate (Dự phòng)"
+    LOCAL = "Pinyin tự động (pypinyin)"
 
 
 @dataclass
@@ -56,6 +123,113 @@ class TranslationResult:
         return result
 
 
+def with_retries(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Gọi func, thử lại tối đa MAX_RETRIES lần với exponential backoff
+    Chỉ thử lại lỗi tạm thời; lỗi khác (sai ngôn ngữ, sai dữ liệu) raise ngay
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            return func(*args, **kwargs)
+        except _TRANSIENT_ERRORS as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = 0.3 * 2 ** (attempt - 1)
+            logger.warning(
+                "✗ Attempt %s failed, retrying in %ss: %s", attempt, delay, e
+            )
+            time.sleep(delay)
+
+
+@lru_cache(maxsize=None)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """
+    OpenAI client dùng chung cho mọi helper cùng API key, giữ connection pool
+    SDK tự thử lại (exponential backoff) với lỗi 429, timeout và 5xx
+    """
+    return OpenAI(
+        api_key=api_key,
+        max_retries=MAX_RETRIES,
+        http_client=httpx.Client(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        ),
+    )
+
+
+@lru_cache(maxsize=32)
+def _get_translate_func(source_lang: str, target_lang: str) -> Callable[[str], str]:
+    """Tạo một lần hàm dịch cho mỗi cặp ngôn ngữ theo thư viện đang có"""
+    if _TRANSLATE_BACKEND == "deep-translator":
+        return DeepGoogleTranslator(source=source_lang, target=target_lang).translate
+
+    translator = Translator()
+    return lambda text: translator.translate(
+        text, src=source_lang, dest=target_lang
+    ).text
+
+
+@lru_cache(maxsize=4096)
+def _translate_cached(text: str, source_lang: str, target_lang: str) -> str:
+    """
+    Dịch có nhớ trong process (từ lặp lại rất thường gặp khi học)
+    Lỗi được raise ra ngoài nên không bị lru_cache lưu lại
+    """
+    cache_key = ai_cache.make_key("google", source_lang, target_lang, text)
+    cached = ai_cache.lookup(cache_key)
+    if cached:
+        return cached["translated"]
+
+    if _TRANSLATE_BACKEND is None:
+        raise RuntimeError("chưa cài deep-translator hoặc googletrans")
+
+    translate = _get_translate_func(source_lang, target_lang)
+    result = with_retries(translate, text)
+    logger.info("✓ Translated with %s: %s...", _TRANSLATE_BACKEND, text[:30])
+
+    ai_cache.store(cache_key, {"success": True, "translated": result})
+    return result
+
+
+class _JSONObjectBuffer:
+    """Gom các mảnh stream cho tới khi nhận đủ một object JSON hoàn chỉnh"""
+
+    def __init__(self):
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Thêm một mảnh text, trả về True khi object JSON đã đóng"""
+        for char in text:
+            if not self._parts and char != "{":
+                # Bỏ qua mọi thứ trước dấu { đầu tiên (vd: ```json)
+                continue
+            self._parts.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    return True
+
+        return False
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+
 class GoogleTranslator:
     """Wrapper cho Google Translate với fallback strategy"""
 
@@ -74,29 +248,12 @@ class GoogleTranslator:
         Returns:
             Dict chứa kết quả dịch
         """
-        # Thử deep-translator trước
         try:
-            from deep_translator import GoogleTranslator as DeepGoogleTranslator
-
-            translator = DeepGoogleTranslator(source=source_lang, target=target_lang)
-            result = translator.translate(text)
-            logger.info(f"✓ Translated with deep-translator: {text[:30]}...")
+            result = _translate_cached(text, source_lang, target_lang)
             return {"success": True, "translated": result}
 
-        except ImportError:
-            logger.warning("deep-translator not installed, trying googletrans...")
-
-        # Fallback sang googletrans
-        try:
-            from googletrans import Translator
-
-            translator = Translator()
-            result = translator.translate(text, src=source_lang, dest=target_lang)
-            logger.info(f"✓ Translated with googletrans: {text[:30]}...")
-            return {"success": True, "translated": result.text}
-
         except Exception as e:
-            logger.error(f"✗ Translation failed: {e}")
+            logger.error("✗ Translation failed: %s", e)
             return {"success": False, "error": f"Lỗi dịch: {str(e)}"}
 
 
@@ -109,13 +266,13 @@ class VocabularyAIHelper:
         result = helper.get_vocabulary_info(chinese="你好")
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
         """
         Khởi tạo AI Helper
 
         Args:
             api_key: OpenAI API key (optional, mặc định lấy từ env)
-            model: Model AI sử dụng (mặc định: gpt-3.5-turbo)
+            model: Model AI sử dụng (mặc định: gpt-4o-mini)
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.model = model
@@ -127,14 +284,17 @@ class VocabularyAIHelper:
         """Lazy initialization của OpenAI client"""
         if self._client is None and self.api_key:
             try:
-                self._client = OpenAI(api_key=self.api_key)
+                self._client = _get_openai_client(self.api_key)
                 logger.info("✓ OpenAI client initialized")
             except Exception as e:
-                logger.error(f"✗ Failed to initialize OpenAI client: {e}")
+                logger.error("✗ Failed to initialize OpenAI client: %s", e)
         return self._client
 
     def get_vocabulary_info(
-        self, chinese: Optional[str] = None, vietnamese: Optional[str] = None
+        self,
+        chinese: Optional[str] = None,
+        vietnamese: Optional[str] = None,
+        need_example: bool = False,
     ) -> Dict[str, Any]:
         """
         Tự động điền thông tin từ vựng bằng AI
@@ -142,6 +302,7 @@ class VocabularyAIHelper:
         Args:
             chinese: Từ tiếng Trung (nếu có)
             vietnamese: Nghĩa tiếng Việt (nếu có)
+            need_example: Có cần câu ví dụ không (chỉ xét khi đã có cả 2 ô)
 
         Returns:
             Dict chứa kết quả với data từ vựng
@@ -152,76 +313,255 @@ class VocabularyAIHelper:
             >>> print(result['data']['vietnamese'])
             'xin chào'
         """
+        # Đã có chữ Hán và nghĩa: chỉ thiếu pinyin, tính tại chỗ không cần AI
+        if chinese and vietnamese and not need_example and lazy_pinyin:
+            return TranslationResult(
+                success=True,
+                method=TranslationMethod.LOCAL.value,
+                data=VocabularyData(
+                    chinese=chinese,
+                    pinyin=" ".join(lazy_pinyin(chinese, style=Style.TONE)),
+                    vietnamese=vietnamese,
+                ),
+            ).to_dict()
+
+        # Kết quả đã tra trước đó thì trả về ngay, không gọi API
+        cache_key = self._cache_key(chinese, vietnamese)
+        cached = ai_cache.lookup(cache_key)
+        if cached:
+            logger.info("✓ Cache hit for: %s", chinese or vietnamese)
+            return cached
+
         # Nếu không có API key hoặc client, dùng Google Translate
         if not self.client:
             logger.warning("OpenAI not available, using Google Translate")
             return self._use_google_fallback(chinese, vietnamese)
 
+        # Câu hỏi gần giống đã tra trước đó (cache ngữ nghĩa)
+        embedding = None
+        if semantic_cache.is_available():
+            embedding = semantic_cache.embed(
+                self.client, " | ".join(filter(None, [chinese, vietnamese]))
+            )
+        if embedding:
+            similar_key = semantic_cache.semantic_index.search(embedding)
+            cached = ai_cache.lookup(similar_key) if similar_key else None
+            if cached:
+                logger.info("✓ Semantic cache hit for: %s", chinese or vietnamese)
+                return cached
+            if similar_key:
+                # Hàng đã hết hạn hoặc bị xóa (vd: purge ở process khác)
+                semantic_cache.semantic_index.remove([similar_key])
+
         try:
-            # Tạo prompt dựa trên input
-            prompt = self._build_prompt(chinese, vietnamese)
-
-            logger.info(f"→ Getting vocabulary info for: {chinese or vietnamese}")
-
-            # Gọi OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Bạn là trợ lý dạy tiếng Trung chuyên nghiệp. Luôn trả về JSON đúng format.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=500,
+            logger.info("→ Getting vocabulary info for: %s", chinese or vietnamese)
+
+            # Gọi OpenAI API (stream để dừng ngay khi JSON đã đủ)
+            stream = self.client.chat.completions.create(
+                **self._request_kwargs(chinese, vietnamese), stream=True
             )
 
             # Parse kết quả
-            result_text = response.choices[0].message.content.strip()
+            result_text = self._read_json_stream(stream)
             vocab_info = self._parse_ai_response(result_text)
 
-            # Xây dựng kết quả
-            result = TranslationResult(
-                success=True,
-                method=TranslationMethod.OPENAI.value,
-                data=VocabularyData(
-                    chinese=vocab_info.get("chinese", chinese or ""),
-                    pinyin=vocab_info.get("pinyin", ""),
-                    vietnamese=vocab_info.get("vietnamese", vietnamese or ""),
-                    example_sentence=vocab_info.get("example", ""),
-                ),
-            )
+            result = self._build_result(vocab_info, chinese, vietnamese)
+            ai_cache.store(cache_key, result, embedding=embedding)
+            if embedding:
+                semantic_cache.semantic_index.add(cache_key, embedding)
 
-            logger.info(f"✓ AI vocabulary info retrieved successfully")
-            return result.to_dict()
+            logger.info("✓ AI vocabulary info retrieved successfully")
+            return result
 
-        except json.JSONDecodeError as e:
-            logger.error(f"✗ AI JSON parsing error, fallback to Google: {e}")
+        except json.JSONDecodeError:
+            logger.exception("✗ AI JSON parsing error, fallback to Google")
             return self._use_google_fallback(chinese, vietnamese)
 
-        except Exception as e:
-            logger.error(f"✗ AI error, fallback to Google: {e}")
+        except Exception:
+            logger.exception("✗ AI error, fallback to Google")
             return self._use_google_fallback(chinese, vietnamese)
 
-    def _build_prompt(self, chinese: Optional[str], vietnamese: Optional[str]) -> str:
-        """Xây dựng prompt cho AI"""
-        base_format = """
-Trả về JSON với format chính xác sau:
-{
-    "chinese": "从",
-    "pinyin": "cóng",
-    "vietnamese": "từ, theo",
-    "example": "我从学校来。(Wǒ cóng xuéxiào lái.) - Tôi đến từ trường học."
-}
+    def get_vocabulary_info_many(
+        self, items: List[Tuple[Optional[str], Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Lấy thông tin cho nhiều từ vựng, gộp tối đa MANY_CHUNK_SIZE từ
+        vào một request OpenAI
+
+        Args:
+            items: Danh sách (chinese, vietnamese) cần tra
+
+        Returns:
+            Danh sách kết quả, cùng thứ tự với items
+        """
+        if not items:
+            return []
+
+        keys = [self._cache_key(c, v) for c, v in items]
+        results = [ai_cache.lookup(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if not result]
+        if not misses:
+            return results
+
+        if not self.client:
+            logger.warning("OpenAI not available, using Google Translate")
+            for i in misses:
+                results[i] = self._use_google_fallback(*items[i])
+            return results
+
+        chunks = [
+            misses[start : start + MANY_CHUNK_SIZE]
+            for start in range(0, len(misses), MANY_CHUNK_SIZE)
+        ]
+        chunk_items = [[items[i] for i in chunk] for chunk in chunks]
+
+        logger.info("→ Getting vocabulary info for %s words", len(misses))
+
+        # Một chunk thì gọi thẳng, nhiều chunk thì chạy song song
+        if len(chunks) == 1:
+            try:
+                fetched = [self._request_many(chunk_items[0])]
+            except Exception as e:
+                fetched = [e]
+        else:
+            fetched = asyncio.run(self._arequest_many_chunks(chunk_items))
+
+        for chunk, vocab_infos in zip(chunks, fetched):
+            if isinstance(vocab_infos, BaseException):
+                logger.error("✗ AI error, fallback to Google: %s", vocab_infos)
+                for i in chunk:
+                    results[i] = self._use_google_fallback(*items[i])
+                continue
+
+            for i, vocab_info in zip(chunk, vocab_infos):
+                # Phần tử sai format thì chỉ từ đó dùng Google Translate
+                if vocab_info is None:
+                    logger.error(
+                        "✗ Invalid AI item, fallback to Google: %s",
+                        items[i][0] or items[i][1],
+                    )
+                    results[i] = self._use_google_fallback(*items[i])
+                    continue
+                results[i] = self._build_result(vocab_info, *items[i])
+                ai_cache.store(keys[i], results[i])
+
+        return results
+
+    def _request_kwargs(
+        self, chinese: Optional[str], vietnamese: Optional[str]
+    ) -> Dict[str, Any]:
+        """Tham số chat.completions.create để tra một từ"""
+        return {
+            "model": self.model,
+            "messages": self._build_messages(self._build_prompt(chinese, vietnamese)),
+            "temperature": 0.3,
+            "max_tokens": 200,
+            "response_format": {"type": "json_object"},
+        }
+
+    def _many_request_kwargs(
+        self, items: List[Tuple[Optional[str], Optional[str]]]
+    ) -> Dict[str, Any]:
+        """Tham số chat.completions.create cho một request gộp"""
+        return {
+            "model": self.model,
+            "messages": self._build_messages(self._build_many_prompt(items)),
+            "temperature": 0.3,
+            "max_tokens": 200 * len(items),
+            "response_format": {"type": "json_object"},
+        }
+
+    def _request_many(
+        self, items: List[Tuple[Optional[str], Optional[str]]]
+    ) -> List[Dict[str, str]]:
+        """Gửi một request gộp và tách kết quả theo từng từ"""
+        response = self.client.chat.completions.create(
+            **self._many_request_kwargs(items)
+        )
+        return self._parse_many_response(
+            response.choices[0].message.content.strip(), len(items)
+        )
+
+    async def _arequest_many_chunks(
+        self, chunks: List[List[Tuple[Optional[str], Optional[str]]]]
+    ) -> List[Union[List[Optional[Dict[str, str]]], BaseException]]:
+        """Gửi song song các request gộp khi danh sách vượt một chunk"""
+
+        async def request_chunk(aclient: AsyncOpenAI, items):
+            response = await aclient.chat.completions.create(
+                **self._many_request_kwargs(items)
+            )
+            return self._parse_many_response(
+                response.choices[0].message.content.strip(), len(items)
+            )
+
+        # Client async sống trong một asyncio.run nên tạo mới mỗi lần,
+        # cùng cấu hình pool/HTTP/2 với _get_openai_client
+        async with AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                ),
+            ),
+        ) as aclient:
+            return await asyncio.gather(
+                *[request_chunk(aclient, items) for items in chunks],
+                return_exceptions=True,
+            )
 
-Lưu ý:
-- chinese: chữ Hán (giữ nguyên hoặc tìm từ phổ biến nhất)
-- pinyin: phiên âm đầy đủ có dấu thanh
-- vietnamese: nghĩa tiếng Việt ngắn gọn, chính xác
-- example: 1 câu ví dụ tiếng Trung + pinyin + nghĩa tiếng Việt
+    def _cache_key(self, chinese: Optional[str], vietnamese: Optional[str]) -> str:
+        """Khóa cache cho một lần tra từ với model hiện tại"""
+        return ai_cache.make_key(self.model, chinese, vietnamese)
 
-Chỉ trả về JSON, không thêm text nào khác.
+    def _read_json_stream(self, stream) -> str:
+        """Đọc stream tới khi object JSON đóng rồi ngắt kết nối"""
+        buffer = _JSONObjectBuffer()
+        try:
+            for chunk in stream:
+                if chunk.choices and buffer.feed(chunk.choices[0].delta.content or ""):
+                    break
+        finally:
+            stream.close()
+        return buffer.getvalue()
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Xây dựng danh sách messages gửi cho OpenAI"""
+        return [
+            {
+                "role": "system",
+                "content": "Bạn là trợ lý dạy tiếng Trung chuyên nghiệp. Luôn trả về JSON đúng format.",
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+    def _build_result(
+        self,
+        vocab_info: Dict[str, str],
+        chinese: Optional[str],
+        vietnamese: Optional[str],
+    ) -> Dict[str, Any]:
+        """Chuyển JSON từ AI thành kết quả chuẩn"""
+        return TranslationResult(
+            success=True,
+            method=TranslationMethod.OPENAI.value,
+            data=VocabularyData(
+                chinese=vocab_info.get("chinese", chinese or ""),
+                pinyin=vocab_info.get("pinyin", ""),
+                vietnamese=vocab_info.get("vietnamese", vietnamese or ""),
+                example_sentence=vocab_info.get("example", ""),
+            ),
+        ).to_dict()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_prompt(chinese: Optional[str], vietnamese: Optional[str]) -> str:
+        """Xây dựng prompt cho AI"""
+        base_format = f"""
+Trả về JSON với format chính xác sau:
+{VOCABULARY_JSON_EXAMPLE}
 """
 
         if chinese:
@@ -231,17 +571,52 @@ Chỉ trả về JSON, không thêm text nào khác.
             return f"""Bạn là trợ lý dạy tiếng Trung. Hãy tìm từ tiếng Trung tương ứng với nghĩa tiếng Việt: "{vietnamese}"
 {base_format}"""
 
+    def _build_many_prompt(
+        self, items: List[Tuple[Optional[str], Optional[str]]]
+    ) -> str:
+        """Xây dựng prompt gộp nhiều từ trong một request"""
+        lines = [
+            (
+                f'{i}. Từ tiếng Trung: "{chinese}"'
+                if chinese
+                else f'{i}. Tìm từ tiếng Trung có nghĩa tiếng Việt: "{vietnamese}"'
+            )
+            for i, (chinese, vietnamese) in enumerate(items, 1)
+        ]
+        items_text = "\n".join(lines)
+
+        return f"""Bạn là trợ lý dạy tiếng Trung. Hãy cung cấp thông tin cho {len(items)} từ sau:
+{items_text}
+
+Trả về JSON dạng {{"items": [...]}} gồm đúng {len(items)} phần tử theo thứ tự trên, mỗi phần tử có format:
+{VOCABULARY_JSON_EXAMPLE}
+"""
+
+    def _parse_many_response(
+        self, text: str, count: int
+    ) -> List[Optional[Dict[str, str]]]:
+        """
+        Parse response gộp, kiểm tra đủ số phần tử
+
+        Phần tử không đúng format được thay bằng None để xử lý riêng từng từ
+        """
+        items = self._parse_ai_response(text).get("items")
+        if not isinstance(items, list) or len(items) != count:
+            raise ValueError(f"AI trả về sai số phần tử (cần {count})")
+        return [item if self._is_valid_vocab_info(item) else None for item in items]
+
+    @staticmethod
+    def _is_valid_vocab_info(item: Any) -> bool:
+        """Phần tử là object và các field (nếu có) đều là chuỗi"""
+        return isinstance(item, dict) and all(
+            isinstance(item.get(field, ""), str)
+            for field in ("chinese", "pinyin", "vietnamese", "example")
+        )
+
     def _parse_ai_response(self, text: str) -> Dict[str, str]:
         """Parse response từ AI, xử lý markdown code blocks"""
-        # Loại bỏ markdown code blocks nếu có
-        if text.startswith("```"):
-            text = text.split("```")[1]
-            if text.startswith("json"):
-                text = text[4:]
-            text = text.strip()
-
-        # Parse JSON
-        return json.loads(text)
+        # JSON mode không bọc code block, regex chỉ dành cho model cũ
+        return json.loads(_CODE_FENCE_RE.sub("", text.strip()))
 
     def _use_google_fallback(
         self, chinese: Optional[str], vietnamese: Optional[str]
@@ -301,7 +676,7 @@ Chỉ trả về JSON, không thêm text nào khác.
             ).to_dict()
 
         except Exception as e:
-            logger.error(f"✗ Google Translate error: {e}")
+            logger.exception("✗ Google Translate error")
             return TranslationResult(
                 success=False,
                 method=TranslationMethod.GOOGLE.value,
@@ -309,6 +684,18 @@ Chỉ trả về JSON, không thêm text nào khác.
             ).to_dict()
 
 
+# Helper dùng chung trong process, giữ OpenAI client và connection pool
+_default_helper: Optional[VocabularyAIHelper] = None
+
+
+def get_default_helper() -> VocabularyAIHelper:
+    """Lấy (tạo lười) VocabularyAIHelper dùng chung"""
+    global _default_helper
+    if _default_helper is None:
+        _default_helper = VocabularyAIHelper()
+    return _default_helper
+
+
 # ============================================
 # Backward compatibility với code cũ
 # ============================================
@@ -320,13 +707,16 @@ def translate_with_google(text, source_lang="auto", target_lang="vi"):
     return translator.translate(text, source_lang, target_lang)
 
 
-def get_ai_vocabulary_info(chinese=None, vietnamese=None):
+def get_ai_vocabulary_info(chinese=None, vietnamese=None, need_example=False):
     """[Deprecated] Sử dụng VocabularyAIHelper.get_vocabulary_info thay thế"""
-    helper = VocabularyAIHelper()
-    return helper.get_vocabulary_info(chinese, vietnamese)
+    return get_default_helper().get_vocabulary_info(chinese, vietnamese, need_example)
+
+
+def get_ai_vocabulary_info_many(items):
+    """[Deprecated] Sử dụng VocabularyAIHelper.get_vocabulary_info_many thay thế"""
+    return get_default_helper().get_vocabulary_info_many(items)
 
 
 def use_google_translate_fallback(chinese=None, vietnamese=None):
     """[Deprecated] Sử dụng VocabularyAIHelper._use_google_fallback thay thế"""
-    helper = VocabularyAIHelper()
-    return helper._use_google_fallback(chinese, vietnamese)
+    return get_default_helper()._use_google_fallback(chinese, vietnamese)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class HomeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'home'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - đăng ký các signal handler
+        from .ai_helper import get_default_helper
+
+        # Tạo sẵn helper và OpenAI client để request đầu tiên không phải chờ
+        get_default_helper().client
@@ -28,6 +28,11 @@ class VocabularyInputForm(forms.Form):
         ),
     )
 
+    need_example = forms.BooleanField(
+        required=False,
+        label="Tạo câu ví dụ bằng AI (khi đã điền cả 2 ô)",
+    )
+
     def clean(self):
         cleaned_data = super().clean()
         chinese = cleaned_data.get("chinese")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from home.models import VocabImportJob
+from home.tasks import poll_vocab_import
+
+
+class Command(BaseCommand):
+    help = "Kiểm tra các lượt nhập từ vựng qua OpenAI Batch API đang chờ"
+
+    def handle(self, *args, **options):
+        jobs = VocabImportJob.objects.filter(
+            status=VocabImportJob.Status.PENDING
+        ).exclude(batch_id="")
+
+        for job in jobs:
+            try:
+                job = poll_vocab_import(job)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f"✗ {job}: {e}"))
+                continue
+            self.stdout.write(f"{job}")
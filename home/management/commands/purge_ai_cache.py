@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from home import ai_cache
+
+
+class Command(BaseCommand):
+    help = "Xóa các kết quả AI đã hết hạn trong bộ nhớ đệm"
+
+    def handle(self, *args, **options):
+        deleted = ai_cache.purge_expired()
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Đã xóa {deleted} kết quả hết hạn")
+        )
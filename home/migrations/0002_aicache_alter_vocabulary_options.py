@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-15 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AICache',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('response', models.TextField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Bộ nhớ đệm AI',
+                'verbose_name_plural': 'Bộ nhớ đệm AI',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='vocabulary',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Từ vựng', 'verbose_name_plural': 'Từ vựng'},
+        ),
+    ]
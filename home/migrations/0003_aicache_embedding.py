@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_aicache_alter_vocabulary_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicache',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
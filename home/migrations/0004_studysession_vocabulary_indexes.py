@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-15 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_aicache_embedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['date'], name='home_session_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['chinese'], name='home_vocab_chinese_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['learned_date'], name='home_vocab_learned_date_idx'),
+        ),
+    ]
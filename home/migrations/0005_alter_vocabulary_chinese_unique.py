@@ -0,0 +1,95 @@
+# Generated by Django 5.2.7 on 2026-10-15 10:30
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def merge_duplicate_vocabularies(apps, schema_editor):
+    """
+    Gộp các bản ghi trùng chữ Hán vào bản được thêm đầu tiên trước khi thêm
+    UNIQUE: giữ độ thuần thục cao nhất, ngày học sớm nhất, bổ sung phiên âm,
+    câu ví dụ, buổi học còn trống và nối các nghĩa khác nhau
+    """
+    Vocabulary = apps.get_model("home", "Vocabulary")
+    vietnamese_max_length = Vocabulary._meta.get_field("vietnamese").max_length
+
+    groups = {}
+    for vocab in Vocabulary.objects.order_by("created_at", "id"):
+        groups.setdefault(vocab.chinese, []).append(vocab)
+
+    merged_words = []
+    duplicate_ids = []
+    for chinese, vocabs in groups.items():
+        if len(vocabs) < 2:
+            continue
+        kept, duplicates = vocabs[0], vocabs[1:]
+
+        meanings = [kept.vietnamese]
+        for vocab in duplicates:
+            kept.mastery_level = max(kept.mastery_level, vocab.mastery_level)
+            kept.learned_date = min(kept.learned_date, vocab.learned_date)
+            kept.pinyin = kept.pinyin or vocab.pinyin
+            kept.example_sentence = kept.example_sentence or vocab.example_sentence
+            kept.session_id = kept.session_id or vocab.session_id
+            if vocab.vietnamese and vocab.vietnamese not in meanings:
+                meanings.append(vocab.vietnamese)
+
+        # Nối nghĩa theo thứ tự thêm, nghĩa nào làm vượt max_length thì bỏ
+        # và ghi log để còn bổ sung tay
+        combined = kept.vietnamese
+        for meaning in meanings[1:]:
+            candidate = f"{combined}; {meaning}" if combined else meaning
+            if len(candidate) <= vietnamese_max_length:
+                combined = candidate
+            else:
+                logger.warning(
+                    "Bỏ nghĩa '%s' của từ %s: vượt %s ký tự",
+                    meaning,
+                    chinese,
+                    vietnamese_max_length,
+                )
+        kept.vietnamese = combined
+        kept.save(
+            update_fields=[
+                "vietnamese",
+                "pinyin",
+                "example_sentence",
+                "session",
+                "learned_date",
+                "mastery_level",
+            ]
+        )
+
+        merged_words.append(f"{chinese} (x{len(vocabs)})")
+        duplicate_ids.extend(vocab.id for vocab in duplicates)
+
+    Vocabulary.objects.filter(id__in=duplicate_ids).delete()
+    if duplicate_ids:
+        logger.info(
+            "Gộp %s từ vựng trùng lặp: %s",
+            len(duplicate_ids),
+            ", ".join(merged_words),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_studysession_vocabulary_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_vocabularies, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='vocabulary',
+            name='home_vocab_chinese_idx',
+        ),
+        migrations.AlterField(
+            model_name='vocabulary',
+            name='chinese',
+            field=models.CharField(max_length=100, unique=True, verbose_name='Tiếng Trung'),
+        ),
+    ]
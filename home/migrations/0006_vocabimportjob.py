@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-15 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0005_alter_vocabulary_chinese_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VocabImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('items', models.JSONField(verbose_name='Danh sách từ')),
+                ('batch_id', models.CharField(blank=True, max_length=100, verbose_name='Batch ID')),
+                ('status', models.CharField(choices=[('pending', 'Đang xử lý'), ('completed', 'Hoàn thành'), ('failed', 'Thất bại')], default='pending', max_length=20, verbose_name='Trạng thái')),
+                ('added_count', models.IntegerField(default=0, verbose_name='Số từ đã thêm')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Lỗi')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Lượt nhập từ vựng',
+                'verbose_name_plural': 'Các lượt nhập từ vựng',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -12,6 +12,9 @@ class StudySession(models.Model):
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["date"], name="home_session_date_idx"),
+        ]
         verbose_name = "Buổi học"
         verbose_name_plural = "Các buổi học"
 
@@ -22,7 +25,7 @@ class StudySession(models.Model):
 class Vocabulary(models.Model):
     """Mô hình lưu trữ từ vựng đã học"""
 
-    chinese = models.CharField(max_length=100, verbose_name="Tiếng Trung")
+    chinese = models.CharField(max_length=100, unique=True, verbose_name="Tiếng Trung")
     pinyin = models.CharField(
         max_length=100, blank=True, null=True, verbose_name="Phiên âm"
     )
@@ -41,8 +44,59 @@ class Vocabulary(models.Model):
 
     class Meta:
         ordering = ["-created_at"]  # Sắp xếp theo thời gian tạo mới nhất
+        indexes = [
+            models.Index(fields=["learned_date"], name="home_vocab_learned_date_idx"),
+        ]
         verbose_name = "Từ vựng"
         verbose_name_plural = "Từ vựng"
 
     def __str__(self):
         return f"{self.chinese} - {self.vietnamese}"
+
+
+class AICache(models.Model):
+    """Bộ nhớ đệm kết quả tra từ (OpenAI / Google Translate)"""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    response = models.TextField()
+    # Embedding float32 đã chuẩn hóa của câu hỏi (cho cache ngữ nghĩa)
+    embedding = models.BinaryField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Bộ nhớ đệm AI"
+        verbose_name_plural = "Bộ nhớ đệm AI"
+
+    def __str__(self):
+        return self.key
+
+
+class VocabImportJob(models.Model):
+    """Lượt nhập từ vựng hàng loạt qua OpenAI Batch API"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Đang xử lý"
+        COMPLETED = "completed", "Hoàn thành"
+        FAILED = "failed", "Thất bại"
+
+    # Danh sách [chinese, vietnamese] cần tra, theo thứ tự custom_id
+    items = models.JSONField(verbose_name="Danh sách từ")
+    batch_id = models.CharField(max_length=100, blank=True, verbose_name="Batch ID")
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Trạng thái",
+    )
+    added_count = models.IntegerField(default=0, verbose_name="Số từ đã thêm")
+    error = models.TextField(blank=True, null=True, verbose_name="Lỗi")
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Lượt nhập từ vựng"
+        verbose_name_plural = "Các lượt nhập từ vựng"
+
+    def __str__(self):
+        return f"Nhập {len(self.items)} từ ({self.get_status_display()})"
@@ -0,0 +1,126 @@
+"""
+Bộ nhớ đệm ngữ nghĩa cho kết quả tra từ
+Tìm kết quả đã lưu của câu hỏi gần giống (vd: "xin chào" và "xin chào!")
+bằng độ tương đồng cosine giữa các embedding
+"""
+
+import logging
+import threading
+from typing import Optional, List, Iterable
+
+from openai import OpenAI
+
+from .models import AICache
+
+try:
+    import numpy as np
+except ImportError:  # numpy là tùy chọn, thiếu thì tắt tầng ngữ nghĩa
+    np = None
+
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Ngưỡng tương đồng để coi hai câu hỏi là một
+SIMILARITY_THRESHOLD = 0.95
+
+
+def is_available() -> bool:
+    """Tầng ngữ nghĩa chỉ hoạt động khi có numpy"""
+    return np is not None
+
+
+def embed(client: OpenAI, text: str) -> Optional[bytes]:
+    """
+    Tạo embedding đã chuẩn hóa cho câu hỏi
+
+    Returns:
+        Vector float32 dạng bytes (để lưu DB), None nếu lỗi
+    """
+    try:
+        response = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    except Exception as e:
+        logger.error("✗ Embedding error: %s", e)
+        return None
+
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tobytes()
+
+
+class SemanticIndex:
+    """Chỉ mục embedding trong bộ nhớ, nạp lười từ bảng AICache"""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._embeddings = None  # np.ndarray [N, D], mỗi hàng đã chuẩn hóa
+        self._keys: List[str] = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        rows = AICache.objects.exclude(embedding=None).values_list(
+            "key", "embedding"
+        )
+        vectors = []
+        for key, embedding in rows:
+            self._keys.append(key)
+            vectors.append(np.frombuffer(embedding, dtype=np.float32))
+
+        if vectors:
+            self._embeddings = np.vstack(vectors)
+        self._loaded = True
+
+    def search(self, embedding: bytes) -> Optional[str]:
+        """Trả về khóa cache gần nhất nếu vượt ngưỡng tương đồng"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if self._embeddings is None:
+                return None
+
+            query = np.frombuffer(embedding, dtype=np.float32)
+            # Các vector đã chuẩn hóa nên tích vô hướng chính là cosine
+            similarities = self._embeddings @ query
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.threshold:
+                return None
+            return self._keys[best]
+
+    def add(self, key: str, embedding: bytes) -> None:
+        """Thêm embedding của một kết quả mới vào chỉ mục"""
+        with self._lock:
+            if not self._loaded:
+                # Hàng mới đã có trong DB nên sẽ được nạp cùng các hàng cũ
+                return
+
+            # store() ghi đè theo khóa nên bỏ hàng cũ của khóa này trước
+            self._drop({key})
+            vector = np.frombuffer(embedding, dtype=np.float32)
+            self._keys.append(key)
+            if self._embeddings is None:
+                self._embeddings = vector[np.newaxis, :]
+            else:
+                self._embeddings = np.vstack([self._embeddings, vector])
+
+
+    def remove(self, keys: Iterable[str]) -> None:
+        """Bỏ các khóa đã bị xóa hoặc hết hạn trong AICache khỏi chỉ mục"""
+        with self._lock:
+            self._drop(set(keys))
+
+    def _drop(self, keys: set) -> None:
+        if not keys or self._embeddings is None:
+            return
+
+        keep = [i for i, key in enumerate(self._keys) if key not in keys]
+        if len(keep) == len(self._keys):
+            return
+
+        self._keys = [self._keys[i] for i in keep]
+        self._embeddings = self._embeddings[keep] if keep else None
+
+
+# Chỉ mục dùng chung trong process
+semantic_index = SemanticIndex()
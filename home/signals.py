@@ -0,0 +1,19 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import StudySession, Vocabulary
+
+
+def dashboard_stats_key(date):
+    """Khóa cache thống kê trang chủ của một ngày"""
+    return f"home:dashboard_stats:{date.isoformat()}"
+
+
+@receiver([post_save, post_delete], sender=Vocabulary)
+@receiver([post_save, post_delete], sender=StudySession)
+def invalidate_dashboard_stats(sender, **kwargs):
+    """Xóa thống kê đã cache khi từ vựng hoặc buổi học thay đổi"""
+    # Trang chủ chỉ đọc khóa của hôm nay nên chỉ cần xóa khóa này
+    cache.delete(dashboard_stats_key(timezone.now().date()))
@@ -0,0 +1,171 @@
+"""
+Nhập từ vựng hàng loạt qua OpenAI Batch API
+Dành cho danh sách lớn không cần kết quả ngay: rẻ hơn ~50%, trả kết quả trong 24h
+"""
+
+import json
+import logging
+from typing import List, Tuple, Optional
+
+from django.utils import timezone
+
+from .ai_helper import get_default_helper
+from .models import Vocabulary, VocabImportJob
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Các trạng thái batch còn đang chạy
+_BATCH_RUNNING = ("validating", "in_progress", "finalizing")
+
+
+def submit_vocab_import(
+    items: List[Tuple[Optional[str], Optional[str]]],
+) -> VocabImportJob:
+    """
+    Tạo file .jsonl request, upload và tạo batch trên OpenAI
+
+    Args:
+        items: Danh sách (chinese, vietnamese) cần tra
+
+    Returns:
+        VocabImportJob đã lưu (status FAILED nếu không gửi được)
+    """
+    helper = get_default_helper()
+    job = VocabImportJob.objects.create(items=[list(item) for item in items])
+
+    if not helper.client:
+        job.status = VocabImportJob.Status.FAILED
+        job.error = "OpenAI không khả dụng"
+        job.save()
+        return job
+
+    requests = [
+        json.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": helper._request_kwargs(chinese, vietnamese),
+            },
+            ensure_ascii=False,
+        )
+        for i, (chinese, vietnamese) in enumerate(items)
+    ]
+
+    try:
+        # Client đã tự thử lại lỗi tạm thời (max_retries), không bọc thêm
+        batch_file = helper.client.files.create(
+            file=(f"vocab_import_{job.id}.jsonl", "\n".join(requests).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = helper.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+        )
+    except Exception as e:
+        logger.error("✗ Failed to submit vocabulary import: %s", e)
+        job.status = VocabImportJob.Status.FAILED
+        job.error = str(e)
+        job.save()
+        return job
+
+    job.batch_id = batch.id
+    job.save()
+
+    logger.info("✓ Submitted vocabulary import %s (%s)", job.id, batch.id)
+    return job
+
+
+def poll_vocab_import(job: VocabImportJob) -> VocabImportJob:
+    """
+    Kiểm tra batch của job, lưu từ vựng vào database khi batch hoàn thành
+
+    Returns:
+        Job sau khi cập nhật trạng thái
+    """
+    helper = get_default_helper()
+    if not helper.client:
+        # Chưa có API key thì để job chờ lần kiểm tra sau
+        logger.warning("OpenAI not available, skip polling import %s", job.id)
+        return job
+
+    batch = helper.client.batches.retrieve(job.batch_id)
+
+    if batch.status in _BATCH_RUNNING:
+        return job
+
+    if batch.status != "completed" or not batch.output_file_id:
+        job.status = VocabImportJob.Status.FAILED
+        job.error = f"Batch kết thúc với trạng thái: {batch.status}"
+        job.completed_at = timezone.now()
+        job.save()
+        return job
+
+    output = helper.client.files.content(batch.output_file_id)
+
+    added_count = 0
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+
+        # Một dòng lỗi chỉ bỏ qua dòng đó, không làm job kẹt ở PENDING
+        try:
+            added_count += _save_batch_line(helper, job, line)
+        except Exception:
+            logger.exception("✗ Failed to import batch line: %s", line[:200])
+
+    job.status = VocabImportJob.Status.COMPLETED
+    job.added_count = added_count
+    job.completed_at = timezone.now()
+    job.save()
+
+    logger.info(
+        "✓ Vocabulary import %s completed: %s words added", job.id, added_count
+    )
+    return job
+
+
+def _save_batch_line(helper, job: VocabImportJob, line: str) -> bool:
+    """Lưu từ vựng từ một dòng output của batch, trả về True nếu thêm mới"""
+    record = json.loads(line)
+    response = record.get("response") or {}
+    if record.get("error") or response.get("status_code") != 200:
+        logger.error("✗ Batch request %s failed", record.get("custom_id"))
+        return False
+
+    chinese, vietnamese = job.items[int(record["custom_id"])]
+    try:
+        vocab_info = helper._parse_ai_response(
+            response["body"]["choices"][0]["message"]["content"].strip()
+        )
+    except json.JSONDecodeError as e:
+        logger.error("✗ AI JSON parsing error: %s", e)
+        return False
+
+    if not helper._is_valid_vocab_info(vocab_info):
+        logger.error("✗ Invalid AI item for batch request %s", record["custom_id"])
+        return False
+
+    vocab_data = helper._build_result(vocab_info, chinese, vietnamese)["data"]
+    # Ưu tiên từ đã yêu cầu; chỉ tra theo nghĩa Việt mới dùng từ AI trả về
+    chinese = chinese or vocab_data["chinese"]
+    if not chinese:
+        logger.error("✗ Missing chinese for batch request %s", record["custom_id"])
+        return False
+
+    _, created = Vocabulary.objects.get_or_create(
+        chinese=chinese,
+        defaults={
+            "pinyin": vocab_data["pinyin"],
+            "vietnamese": vocab_data["vietnamese"],
+            "example_sentence": vocab_data["example_sentence"],
+            "learned_date": timezone.now().date(),
+            "mastery_level": 1,
+        },
+    )
+    return created
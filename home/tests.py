@@ -1,3 +1,117 @@
+import json
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import ai_cache, semantic_cache
+from .ai_helper import VocabularyAIHelper
+from .models import Vocabulary, VocabImportJob
+from .tasks import poll_vocab_import
+
+
+class VocabularyInfoManyTests(TestCase):
+    def test_invalid_item_falls_back_per_word(self):
+        helper = VocabularyAIHelper(api_key="test")
+        helper._client = mock.Mock()
+        response = mock.MagicMock()
+        response.choices[0].message.content = (
+            '{"items": [{"chinese": "你好", "pinyin": "nǐ hǎo", '
+            '"vietnamese": "xin chào", "example": ""}, "oops"]}'
+        )
+        helper._client.chat.completions.create.return_value = response
+        fallback = {"success": True, "method": "google"}
+
+        with mock.patch.object(
+            helper, "_use_google_fallback", return_value=fallback
+        ) as use_google:
+            results = helper.get_vocabulary_info_many([("你好", None), ("谢谢", None)])
+
+        self.assertEqual(results[0]["data"]["pinyin"], "nǐ hǎo")
+        self.assertIs(results[1], fallback)
+        use_google.assert_called_once_with("谢谢", None)
+
+
+class PollVocabImportTests(TestCase):
+    def batch_line(self, custom_id, content):
+        body = {"choices": [{"message": {"content": json.dumps(content)}}]}
+        return json.dumps(
+            {"custom_id": str(custom_id), "response": {"status_code": 200, "body": body}}
+        )
+
+    def test_bad_lines_are_skipped_and_requested_word_is_kept(self):
+        job = VocabImportJob.objects.create(
+            items=[["你好", None], ["谢谢", None], ["再见", None]], batch_id="b1"
+        )
+        helper = VocabularyAIHelper(api_key="test")
+        helper._client = mock.MagicMock()
+        helper._client.batches.retrieve.return_value = mock.Mock(
+            status="completed", output_file_id="f1"
+        )
+        helper._client.files.content.return_value.text = "\n".join(
+            [
+                self.batch_line(0, {"chinese": "你們好", "pinyin": "nǐ hǎo"}),
+                self.batch_line(1, {"chinese": "谢谢", "pinyin": None}),
+                "not json",
+            ]
+        )
+
+        with mock.patch("home.tasks.get_default_helper", return_value=helper):
+            poll_vocab_import(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, VocabImportJob.Status.COMPLETED)
+        self.assertEqual(job.added_count, 1)
+        self.assertEqual(
+            list(Vocabulary.objects.values_list("chinese", flat=True)), ["你好"]
+        )
+
+    def test_job_stays_pending_without_client(self):
+        job = VocabImportJob.objects.create(items=[["你好", None]], batch_id="b1")
+        helper = mock.Mock(client=None)
+
+        with mock.patch("home.tasks.get_default_helper", return_value=helper):
+            poll_vocab_import(job)
+
+        self.assertEqual(job.status, VocabImportJob.Status.PENDING)
+
+
+@skipUnless(semantic_cache.is_available(), "cần numpy")
+class SemanticIndexTests(TestCase):
+    def embedding(self, *values):
+        vector = semantic_cache.np.asarray(values, dtype=semantic_cache.np.float32)
+        return (vector / semantic_cache.np.linalg.norm(vector)).tobytes()
+
+    def test_purged_keys_are_dropped_from_index(self):
+        ai_cache.store("old", {}, embedding=self.embedding(1, 0))
+        ai_cache.store("new", {}, embedding=self.embedding(0, 1))
+        index = semantic_cache.SemanticIndex()
+        self.assertEqual(index.search(self.embedding(1, 0)), "old")
+
+        index.remove(["old"])
+
+        self.assertIsNone(index.search(self.embedding(1, 0)))
+        self.assertEqual(index.search(self.embedding(0, 1)), "new")
+
+
+class VocabularyAdminTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+        self.vocab = Vocabulary.objects.create(
+            chinese="你好", vietnamese="xin chào", example_sentence="你好吗？"
+        )
+
+    def test_change_view_loads_example_without_extra_query(self):
+        url = reverse("admin:home_vocabulary_change", args=[self.vocab.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
 
-# Create your tests here.
+        self.assertContains(response, "你好吗？")
+        vocab_queries = [
+            q for q in queries.captured_queries if 'FROM "home_vocabulary"' in q["sql"]
+        ]
+        self.assertEqual(len(vocab_queries), 1)
@@ -1,95 +1,134 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.db.models import Count, Sum
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from datetime import timedelta
+from itertools import zip_longest
 from .models import StudySession, Vocabulary
 from .forms import VocabularyInputForm
-from .ai_helper import get_ai_vocabulary_info
+from .ai_helper import get_ai_vocabulary_info, get_ai_vocabulary_info_many
+from .tasks import submit_vocab_import
+from .signals import dashboard_stats_key
 import json
 
+# Thời gian cache thống kê trang chủ (giây)
+DASHBOARD_STATS_TIMEOUT = 300
+
+# Danh sách lớn hơn ngưỡng này sẽ được nhập qua OpenAI Batch API (không chờ)
+BULK_IMPORT_THRESHOLD = 50
+
 
 def home_view(request):
     # Lấy ngày hôm nay
     today = timezone.now().date()
 
-    # Thống kê hôm nay
-    today_sessions = StudySession.objects.filter(date=today)
-    today_vocab_count = Vocabulary.objects.filter(learned_date=today).count()
-    today_study_time = (
-        today_sessions.aggregate(total=Sum("duration_minutes"))["total"] or 0
-    )
-
-    # Thống kê tuần này (7 ngày gần nhất)
-    week_ago = today - timedelta(days=7)
-    week_sessions = StudySession.objects.filter(date__gte=week_ago)
-    week_vocab_count = Vocabulary.objects.filter(learned_date__gte=week_ago).count()
-    week_study_time = (
-        week_sessions.aggregate(total=Sum("duration_minutes"))["total"] or 0
-    )
-
-    # Thống kê tổng
-    total_sessions = StudySession.objects.count()
-    total_vocab = Vocabulary.objects.count()
-    total_study_time = (
-        StudySession.objects.aggregate(total=Sum("duration_minutes"))["total"] or 0
+    # Thống kê chỉ đổi khi có ghi dữ liệu nên được cache, signal sẽ xóa cache
+    stats = cache.get_or_set(
+        dashboard_stats_key(today),
+        lambda: _get_dashboard_stats(today),
+        DASHBOARD_STATS_TIMEOUT,
     )
 
     # Lấy các buổi học gần nhất (5 buổi)
     recent_sessions = StudySession.objects.all()[:5]
 
-    # Lấy từ vựng học hôm nay
-    today_vocabularies = Vocabulary.objects.filter(learned_date=today)[:10]
+    # Lấy từ vựng học hôm nay (chỉ các cột template hiển thị)
+    today_vocabularies = Vocabulary.objects.filter(learned_date=today).only(
+        "chinese", "pinyin", "vietnamese", "example_sentence"
+    )[:10]
 
     context = {
+        **stats,
+        "recent_sessions": recent_sessions,
+        "today_vocabularies": today_vocabularies,
+    }
+
+    return render(request, "home/home.html", context)
+
+
+def _get_dashboard_stats(today):
+    """Thống kê hôm nay / tuần này (7 ngày gần nhất) / tổng - mỗi bảng 1 query"""
+    week_ago = today - timedelta(days=7)
+
+    session_stats = StudySession.objects.aggregate(
+        today_time=Sum("duration_minutes", filter=Q(date=today)),
+        week_time=Sum("duration_minutes", filter=Q(date__gte=week_ago)),
+        total_time=Sum("duration_minutes"),
+        today_count=Count("id", filter=Q(date=today)),
+        week_count=Count("id", filter=Q(date__gte=week_ago)),
+        total_count=Count("id"),
+    )
+    vocab_stats = Vocabulary.objects.aggregate(
+        today_count=Count("id", filter=Q(learned_date=today)),
+        week_count=Count("id", filter=Q(learned_date__gte=week_ago)),
+        total_count=Count("id"),
+    )
+
+    return {
         "today": {
-            "vocab_count": today_vocab_count,
-            "study_time": today_study_time,
-            "session_count": today_sessions.count(),
+            "vocab_count": vocab_stats["today_count"],
+            "study_time": session_stats["today_time"] or 0,
+            "session_count": session_stats["today_count"],
         },
         "week": {
-            "vocab_count": week_vocab_count,
-            "study_time": week_study_time,
-            "session_count": week_sessions.count(),
+            "vocab_count": vocab_stats["week_count"],
+            "study_time": session_stats["week_time"] or 0,
+            "session_count": session_stats["week_count"],
         },
         "total": {
-            "vocab_count": total_vocab,
-            "study_time": total_study_time,
-            "session_count": total_sessions,
+            "vocab_count": vocab_stats["total_count"],
+            "study_time": session_stats["total_time"] or 0,
+            "session_count": session_stats["total_count"],
         },
-        "recent_sessions": recent_sessions,
-        "today_vocabularies": today_vocabularies,
     }
 
-    return render(request, "home/home.html", context)
-
 
 def add_vocabulary_view(request):
     """Trang thêm từ vựng với AI tự động điền"""
     if request.method == "POST":
+        # Nhiều từ trong cùng một request - gộp thành một lần gọi AI
+        pairs = _get_posted_pairs(request)
+        if len(pairs) > BULK_IMPORT_THRESHOLD:
+            return _import_vocabulary_batch(request, pairs)
+        if len(pairs) > 1:
+            return _add_vocabulary_bulk(request, pairs)
+
         form = VocabularyInputForm(request.POST)
 
         if form.is_valid():
             chinese = form.cleaned_data.get("chinese")
             vietnamese = form.cleaned_data.get("vietnamese")
+            need_example = form.cleaned_data.get("need_example")
 
             # Gọi AI để lấy thông tin đầy đủ
-            ai_result = get_ai_vocabulary_info(chinese=chinese, vietnamese=vietnamese)
+            ai_result = get_ai_vocabulary_info(
+                chinese=chinese, vietnamese=vietnamese, need_example=need_example
+            )
 
             if ai_result["success"]:
                 vocab_data = ai_result["data"]
                 chinese_word = vocab_data["chinese"]
 
-                # Kiểm tra từ vựng đã tồn tại chưa
-                existing_vocab = Vocabulary.objects.filter(chinese=chinese_word).first()
+                # Lưu từ mới vào database (bỏ qua nếu đã tồn tại)
+                vocab, created = Vocabulary.objects.get_or_create(
+                    chinese=chinese_word,
+                    defaults={
+                        "pinyin": vocab_data["pinyin"],
+                        "vietnamese": vocab_data["vietnamese"],
+                        "example_sentence": vocab_data["example_sentence"],
+                        "learned_date": timezone.now().date(),
+                        "mastery_level": 1,
+                    },
+                )
 
-                if existing_vocab:
+                if not created:
                     # Từ đã tồn tại - hiển thị thông báo
                     messages.warning(
                         request,
                         f'⚠️ Từ "{chinese_word}" đã có trong từ điển! '
-                        f"Nghĩa: {existing_vocab.vietnamese}. "
-                        f'Học lần đầu: {existing_vocab.learned_date.strftime("%d/%m/%Y")}',
+                        f"Nghĩa: {vocab.vietnamese}. "
+                        f'Học lần đầu: {vocab.learned_date.strftime("%d/%m/%Y")}',
                     )
 
                     # Vẫn hiển thị kết quả AI để người dùng xem
@@ -98,21 +137,11 @@ def add_vocabulary_view(request):
                         "ai_result": vocab_data,
                         "method": ai_result.get("method", "AI"),
                         "duplicate": True,
-                        "existing_vocab": existing_vocab,
+                        "existing_vocab": vocab,
                         "recent_vocabs": Vocabulary.objects.all()[:5],
                     }
                     return render(request, "home/add_vocabulary.html", context)
 
-                # Lưu từ mới vào database
-                vocab = Vocabulary.objects.create(
-                    chinese=vocab_data["chinese"],
-                    pinyin=vocab_data["pinyin"],
-                    vietnamese=vocab_data["vietnamese"],
-                    example_sentence=vocab_data["example_sentence"],
-                    learned_date=timezone.now().date(),
-                    mastery_level=1,
-                )
-
                 # Hiển thị phương thức đã dùng (AI hoặc Google Translate)
                 method = ai_result.get("method", "AI")
                 messages.success(
@@ -167,3 +196,75 @@ def add_vocabulary_view(request):
     }
 
     return render(request, "home/add_vocabulary.html", context)
+
+
+def _get_posted_pairs(request):
+    """Lấy danh sách (chinese, vietnamese) từ POST, bỏ qua các dòng trống"""
+    chinese_list = [c.strip() for c in request.POST.getlist("chinese")]
+    vietnamese_list = [v.strip() for v in request.POST.getlist("vietnamese")]
+
+    return [
+        (chinese or None, vietnamese or None)
+        for chinese, vietnamese in zip_longest(
+            chinese_list, vietnamese_list, fillvalue=""
+        )
+        if chinese or vietnamese
+    ]
+
+
+def _add_vocabulary_bulk(request, pairs):
+    """Thêm nhiều từ vựng cùng lúc, gộp các từ vào một lần gọi AI"""
+    results = get_ai_vocabulary_info_many(pairs)
+
+    added, duplicates, errors = [], [], []
+    for ai_result in results:
+        if not ai_result["success"]:
+            errors.append(ai_result["error"])
+            continue
+
+        vocab_data = ai_result["data"]
+        vocab, created = Vocabulary.objects.get_or_create(
+            chinese=vocab_data["chinese"],
+            defaults={
+                "pinyin": vocab_data["pinyin"],
+                "vietnamese": vocab_data["vietnamese"],
+                "example_sentence": vocab_data["example_sentence"],
+                "learned_date": timezone.now().date(),
+                "mastery_level": 1,
+            },
+        )
+        (added if created else duplicates).append(vocab)
+
+    if added:
+        messages.success(
+            request,
+            f"✅ Đã thêm {len(added)} từ vựng mới: "
+            + ", ".join(vocab.chinese for vocab in added),
+        )
+        request.session["last_added_vocab_id"] = added[-1].id
+    if duplicates:
+        messages.warning(
+            request,
+            "⚠️ Đã có trong từ điển: "
+            + ", ".join(vocab.chinese for vocab in duplicates),
+        )
+    for error in errors:
+        messages.error(request, f"❌ Lỗi: {error}")
+
+    return redirect("add_vocabulary")
+
+
+def _import_vocabulary_batch(request, pairs):
+    """Gửi danh sách lớn sang OpenAI Batch API, từ vựng sẽ được thêm sau"""
+    job = submit_vocab_import(pairs)
+
+    if job.status == job.Status.FAILED:
+        messages.error(request, f"❌ Lỗi: {job.error}")
+    else:
+        messages.info(
+            request,
+            f"⏳ Đã gửi {len(pairs)} từ để xử lý nền, "
+            f"từ vựng sẽ được thêm trong vòng 24 giờ.",
+        )
+
+    return redirect("add_vocabulary")
@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import Vocabulary
 
-# Register your models here.
+
+@admin.register(Vocabulary)
+class VocabularyAdmin(admin.ModelAdmin):
+    list_display = ["chinese", "pinyin", "vietnamese", "created_at"]
+    search_fields = ["chinese", "vietnamese"]
+    ordering = ["-created_at"]
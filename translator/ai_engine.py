@@ -4,24 +4,137 @@ Cung cấp các chức năng AI thông minh với OpenAI API
 """
 
 import os
+import re
 import json
+import atexit
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+import httpx
+from typing import Optional, Dict, Any, List, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from openai import OpenAI
+from pathlib import Path
+from openai import OpenAI, AsyncOpenAI
 from openai.types.chat import ChatCompletion
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Vocabulary
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson là tùy chọn, thiếu thì dùng json chuẩn
+    _json_loads = json.loads
+
+try:
+    import h2  # noqa: F401 - httpx cần h2 để dùng HTTP/2
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
 
 
-# Cấu hình logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Thời gian lưu kết quả dịch trong cache (giây)
+TRANSLATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Tăng version này để vô hiệu hóa toàn bộ kết quả dịch đã cache
+_CACHE_VERSION_KEY = "tr:version"
+
+
+# File export từ vựng, nằm cố định trong thư mục project
+VOCABULARY_FILE = Path(settings.BASE_DIR) / "tu_vung_trung_viet.txt"
+
+
+# Các request đến trong cửa sổ này được gộp thành một lần gọi OpenAI
+BATCH_WINDOW = 0.03
+BATCH_MAX_SIZE = 8
+
+
+# Connection pool cho httpx: nhiều request song song dùng chung kết nối
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+# System prompt
+SYSTEM_PROMPT = """
+Bạn là Gia sư song ngữ Trung - Việt chuyên nghiệp.
+1. Nếu nhập Tiếng Trung: Hiện Pinyin -> Dịch Việt.
+2. Nếu nhập Tiếng Việt: Dịch Trung -> Hiện Pinyin.
+Điền chinese, pinyin, vietnamese bằng từ/câu tiếng Trung, phiên âm và
+nghĩa tiếng Việt để lưu từ vựng; explanation là câu trả lời cho người học.
+"""
+
+# Structured Outputs: AI trả về đủ thông tin trong một lần gọi
+TRANSLATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "chinese": {
+            "type": "string",
+            "description": "Từ vựng Tiếng Trung",
+        },
+        "pinyin": {
+            "type": "string",
+            "description": "Phiên âm Pinyin",
+        },
+        "vietnamese": {
+            "type": "string",
+            "description": "Nghĩa Tiếng Việt",
+        },
+        "explanation": {
+            "type": "string",
+            "description": "Bản dịch kèm Pinyin và giải thích cho người học",
+        },
+    },
+    "required": ["chinese", "pinyin", "vietnamese", "explanation"],
+    "additionalProperties": False,
+}
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translation",
+        "strict": True,
+        "schema": TRANSLATION_SCHEMA,
+    },
+}
+
+# Schema cho nhiều câu gộp trong một lần gọi (micro-batching)
+BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "items": {"type": "array", "items": TRANSLATION_SCHEMA},
+            },
+            "required": ["items"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+class TranslationTruncatedError(ValueError):
+    """OpenAI dừng vì hết max_completion_tokens, JSON trả về bị cắt ngang"""
+
+
+TRUNCATED_MESSAGE = "✗ Kết quả dịch quá dài nên bị cắt ngang. Hãy chia nhỏ đoạn cần dịch."
+
+
 class ModelType(Enum):
     """Các model AI hỗ trợ"""
 
     GPT4O = "gpt-4o"
+    GPT4O_MINI = "gpt-4o-mini"
     GPT4_TURBO = "gpt-4-turbo-preview"
     GPT35_TURBO = "gpt-3.5-turbo"
 
@@ -31,18 +144,25 @@ class AIConfig:
     """Cấu hình cho AI Engine"""
 
     api_key: Optional[str] = None
-    model: str = ModelType.GPT4O.value
+    model: str = ModelType.GPT4O_MINI.value
+    # Đoạn văn dài (tính theo ký tự) dùng model mạnh hơn, None để tắt
+    long_text_model: Optional[str] = ModelType.GPT4O.value
+    long_text_threshold: int = 200
     temperature: float = 0.3
+    # Giới hạn token trả về: JSON gồm cả câu gốc, pinyin, nghĩa và giải thích
     max_tokens: int = 1000
+    long_text_max_tokens: int = 2000
     timeout: int = 30
     max_retries: int = 3
+    # Số request OpenAI chạy song song tối đa (tránh lỗi 429 khi tải cao)
+    max_concurrent_requests: int = 64
 
     def __post_init__(self):
         if not self.api_key:
             self.api_key = os.environ.get("OPENAI_API_KEY")
 
 
-@dataclass
+@dataclass(slots=True)
 class VocabularyEntry:
     """Dữ liệu từ vựng"""
 
@@ -59,6 +179,156 @@ class VocabularyEntry:
             "example": self.example,
         }
 
+    def to_explanation(self) -> str:
+        """Câu trả lời cho người học khi từ đã có sẵn trong kho"""
+        return f"{self.chinese} ({self.pinyin})\n→ {self.vietnamese}"
+
+
+# Ký tự Hán (CJK Unified Ideographs)
+_HAN_RE = re.compile(r"[\u4e00-\u9fff]")
+
+
+def _check_input(text: str) -> Optional[str]:
+    """Trả về thông báo nếu text không có gì để dịch, ngược lại None"""
+    if not text:
+        return "✗ Vui lòng nhập nội dung cần dịch."
+    if not _HAN_RE.search(text) and not any(c.isalpha() for c in text):
+        return "✗ Không có nội dung để dịch (chỉ gồm dấu câu hoặc ký hiệu)."
+    return None
+
+
+class _TranslationBatcher:
+    """
+    Gom các atranslate đến gần nhau (trong BATCH_WINDOW giây) thành một lần
+    gọi OpenAI, rồi trả kết quả về cho từng request
+    """
+
+    def __init__(self, engine: "ChineseAIEngine"):
+        self._engine = engine
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        # Giữ tham chiếu tới các task gửi batch để không bị GC giữa chừng
+        self._dispatch_tasks: set = set()
+
+    async def submit(self, text: str) -> Dict[str, str]:
+        """Đưa một câu vào hàng đợi và chờ kết quả dịch"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        return await future
+
+    async def _run(self) -> None:
+        # Dừng khi hàng đợi trống để không để lại task treo trong loop
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = loop.time() + BATCH_WINDOW
+
+            while len(batch) < BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Mỗi batch chỉ gồm các câu cùng model để cache đúng khóa
+            groups: Dict[str, list] = {}
+            for item in batch:
+                groups.setdefault(self._engine._model_for(item[0]), []).append(item)
+
+            for group in groups.values():
+                task = asyncio.create_task(self._dispatch(group))
+                self._dispatch_tasks.add(task)
+                task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch) -> None:
+        texts = [text for text, _ in batch]
+
+        if len(batch) == 1:
+            results = await asyncio.gather(
+                self._engine._arequest_translation(texts[0]), return_exceptions=True
+            )
+        else:
+            try:
+                results = await self._engine._arequest_translations(texts)
+                logger.info("✓ Batched %s translations in one request", len(texts))
+            except Exception as e:
+                # Gộp thất bại thì dịch riêng từng câu
+                logger.error("✗ Batch translation error, retrying one by one: %s", e)
+                results = await asyncio.gather(
+                    *[self._engine._arequest_translation(text) for text in texts],
+                    return_exceptions=True,
+                )
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        # Cả batch được lưu bằng một câu INSERT và một lần ghi file
+        translations = [r for r in results if not isinstance(r, BaseException)]
+        if translations:
+            self._engine._save_in_background(*translations)
+
+
+class _JSONStringFieldStream:
+    """
+    Lấy dần giá trị chuỗi của một field trong lúc JSON còn đang được stream,
+    để gửi phần giải thích cho người học mà không chờ cả response
+    """
+
+    def __init__(self, field: str):
+        self._marker = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """Thêm chunk mới, trả về phần giá trị field vừa decode được"""
+        self._buffer += chunk
+        if self._done:
+            return ""
+
+        if self._pos is None:
+            match = self._marker.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf):
+            if buf[i] == '"':
+                self._done = True
+                break
+            if buf[i] == "\\":
+                # Không cắt ngang escape (kể cả cặp surrogate \uD83D\uDE00)
+                size = 2
+                if buf[i + 1 : i + 2] == "u":
+                    high = buf[i + 2 : i + 4].lower() in ("d8", "d9", "da", "db")
+                    size = 12 if high else 6
+                if i + size > len(buf):
+                    break
+                i += size
+            else:
+                i += 1
+
+        raw = buf[self._pos : i]
+        self._pos = i
+        return json.loads(f'"{raw}"') if raw else ""
+
+    def getvalue(self) -> str:
+        """Toàn bộ JSON đã nhận"""
+        return self._buffer
+
 
 class ChineseAIEngine:
     """
@@ -78,44 +348,38 @@ class ChineseAIEngine:
         """
         self.config = config or AIConfig()
         self._client: Optional[OpenAI] = None
-        self._vocabulary_file = "tu_vung_trung_viet.txt"
-
-        # System prompts
-        self.system_prompt = """
-        Bạn là Gia sư song ngữ Trung - Việt chuyên nghiệp.
-        1. Nếu nhập Tiếng Trung: Hiện Pinyin -> Dịch Việt -> Lưu từ mới.
-        2. Nếu nhập Tiếng Việt: Dịch Trung -> Hiện Pinyin -> Lưu từ Trung mới dịch được.
-        Luôn ưu tiên gọi hàm 'luu_tu_vung' để lưu từ vựng.
-        """
-
-        # Tools schema
-        self.tools_schema = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "save_vocabulary",
-                    "description": "Lưu từ vựng tiếng Trung, Pinyin và nghĩa tiếng Việt.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "chinese": {
-                                "type": "string",
-                                "description": "Từ vựng Tiếng Trung",
-                            },
-                            "pinyin": {
-                                "type": "string",
-                                "description": "Phiên âm Pinyin",
-                            },
-                            "vietnamese": {
-                                "type": "string",
-                                "description": "Nghĩa Tiếng Việt",
-                            },
-                        },
-                        "required": ["chinese", "pinyin", "vietnamese"],
-                    },
-                },
-            }
-        ]
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._vocabulary_path = VOCABULARY_FILE
+
+        # Mở một lần (lần ghi đầu tiên) với O_APPEND: kernel tự nối dòng mới
+        # vào cuối file, mỗi os.write là một lần ghi nguyên vẹn nên không cần lock
+        self._vocab_fd: Optional[int] = None
+        self._vocab_fd_lock = threading.Lock()
+
+        # Ghi từ vựng ở thread riêng, request trả kết quả ngay không chờ I/O
+        # (thread chỉ được tạo khi có việc đầu tiên)
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vocab-writer"
+        )
+
+        # Từ vựng đã lưu, nạp từ database lần đầu cần tra
+        self._vocab_index: Optional[Dict[str, VocabularyEntry]] = None
+        self._vocab_index_lock = threading.Lock()
+
+        # Prompt và schema dùng chung cho mọi instance
+        self.system_prompt = SYSTEM_PROMPT
+        self.response_format = RESPONSE_FORMAT
+        self.batch_response_format = BATCH_RESPONSE_FORMAT
+
+        # System message giống hệt nhau ở mọi request để OpenAI cache prefix
+        self._system_message = {"role": "system", "content": self.system_prompt}
+
+        # Bộ gom request theo event loop (giống async_client)
+        self._batcher: Optional[_TranslationBatcher] = None
+        self._batcher_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._api_semaphore: Optional[asyncio.Semaphore] = None
+        self._api_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
     def client(self) -> OpenAI:
@@ -132,17 +396,55 @@ class ChineseAIEngine:
                     api_key=self.config.api_key,
                     timeout=self.config.timeout,
                     max_retries=self.config.max_retries,
+                    http_client=httpx.Client(
+                        http2=_HTTP2_AVAILABLE,
+                        limits=HTTP_LIMITS,
+                        timeout=self.config.timeout,
+                    ),
                 )
                 logger.info("✓ OpenAI client initialized successfully")
             except Exception as e:
-                logger.error(f"✗ Failed to initialize OpenAI client: {e}")
+                logger.error("✗ Failed to initialize OpenAI client: %s", e)
                 raise
 
         return self._client
 
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Lazy initialization của AsyncOpenAI client
+
+        Connection pool của client gắn với event loop, nên chỉ tạo lại khi
+        loop đổi. Project chạy ASGI (daphne) nên cả process dùng một loop;
+        chạy WSGI thì mỗi request một loop và client không được dùng lại
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            if not self.config.api_key:
+                raise ValueError(
+                    "API key không tồn tại. Vui lòng cấu hình OPENAI_API_KEY "
+                    "trong biến môi trường hoặc truyền vào config."
+                )
+
+            self._async_client = AsyncOpenAI(
+                api_key=self.config.api_key,
+                timeout=self.config.timeout,
+                max_retries=self.config.max_retries,
+                http_client=httpx.AsyncClient(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=HTTP_LIMITS,
+                    timeout=self.config.timeout,
+                ),
+            )
+            self._async_client_loop = loop
+            logger.info("✓ AsyncOpenAI client initialized successfully")
+
+        return self._async_client
+
     def save_vocabulary(self, chinese: str, pinyin: str, vietnamese: str) -> str:
         """
-        Lưu từ vựng vào file
+        Lưu từ vựng vào database (UNIQUE theo chinese), từ mới được ghi
+        thêm vào file export
 
         Args:
             chinese: Từ tiếng Trung
@@ -154,17 +456,118 @@ class ChineseAIEngine:
         """
         try:
             entry = VocabularyEntry(chinese, pinyin, vietnamese)
-            content = f"{entry.chinese} ({entry.pinyin}) : {entry.vietnamese}\n"
+            _, created = Vocabulary.objects.update_or_create(
+                chinese=entry.chinese,
+                defaults={"pinyin": entry.pinyin, "vietnamese": entry.vietnamese},
+            )
 
-            with open(self._vocabulary_file, "a", encoding="utf-8") as f:
-                f.write(content)
+            if created:
+                self._append_vocabulary_file(entry)
+            if self._vocab_index is not None:
+                self._vocab_index[entry.chinese] = entry
 
-            logger.info(f"✓ Saved vocabulary: {chinese}")
+            logger.info("✓ Saved vocabulary: %s", chinese)
             return f"✓ Đã lưu: {chinese} ({pinyin})"
 
         except Exception as e:
-            logger.error(f"✗ Failed to save vocabulary: {e}")
-            return f"✗ Lỗi ghi file: {e}"
+            logger.error("✗ Failed to save vocabulary: %s", e)
+            return f"✗ Lỗi lưu từ vựng: {e}"
+
+    def save_vocabulary_many(self, entries: List[VocabularyEntry]) -> None:
+        """
+        Lưu nhiều từ vựng bằng một câu INSERT (upsert theo chinese) và một
+        lần ghi file export
+
+        Args:
+            entries: Danh sách từ vựng cần lưu
+        """
+        unique = {entry.chinese: entry for entry in entries}
+        try:
+            existing = set(
+                Vocabulary.objects.filter(chinese__in=unique).values_list(
+                    "chinese", flat=True
+                )
+            )
+            Vocabulary.objects.bulk_create(
+                [
+                    Vocabulary(
+                        chinese=entry.chinese,
+                        pinyin=entry.pinyin,
+                        vietnamese=entry.vietnamese,
+                    )
+                    for entry in unique.values()
+                ],
+                update_conflicts=True,
+                unique_fields=["chinese"],
+                update_fields=["pinyin", "vietnamese"],
+            )
+
+            new_entries = [e for c, e in unique.items() if c not in existing]
+            if new_entries:
+                self._append_vocabulary_file(*new_entries)
+            if self._vocab_index is not None:
+                self._vocab_index.update(unique)
+
+            logger.info("✓ Saved %s vocabulary entries", len(unique))
+
+        except Exception as e:
+            logger.error("✗ Failed to save vocabulary: %s", e)
+
+    def _append_vocabulary_file(self, *entries: VocabularyEntry) -> None:
+        """Ghi thêm các dòng vào file export từ vựng bằng một lần os.write"""
+        if self._vocab_fd is None:
+            with self._vocab_fd_lock:
+                if self._vocab_fd is None:
+                    self._vocab_fd = os.open(
+                        self._vocabulary_path,
+                        os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                        0o644,
+                    )
+
+        content = "".join(
+            f"{entry.chinese} ({entry.pinyin}) : {entry.vietnamese}\n"
+            for entry in entries
+        )
+        os.write(self._vocab_fd, content.encode("utf-8"))
+
+    def _save_in_background(self, *translations: Dict[str, str]) -> None:
+        """Đưa việc lưu từ vựng sang thread ghi, không chờ kết quả"""
+        entries = [
+            VocabularyEntry(t["chinese"], t["pinyin"], t["vietnamese"])
+            for t in translations
+        ]
+        self._io_pool.submit(self.save_vocabulary_many, entries)
+
+    def close(self) -> None:
+        """Chờ ghi xong các từ vựng còn trong hàng đợi rồi đóng file"""
+        self._io_pool.shutdown(wait=True)
+        if self._vocab_fd is not None:
+            os.close(self._vocab_fd)
+            self._vocab_fd = None
+
+    def lookup_vocabulary(self, text: str) -> Optional[VocabularyEntry]:
+        """Tra từ trong kho từ vựng đã lưu (không gọi API)"""
+        if self._vocab_index is None:
+            with self._vocab_index_lock:
+                if self._vocab_index is None:
+                    rows = Vocabulary.objects.values_list(
+                        "chinese", "pinyin", "vietnamese"
+                    )
+                    self._vocab_index = {
+                        row[0]: VocabularyEntry(*row) for row in rows
+                    }
+                    logger.info(
+                        "✓ Loaded %s vocabulary entries", len(self._vocab_index)
+                    )
+
+        return self._vocab_index.get(text.strip())
+
+    async def alookup_vocabulary(self, text: str) -> Optional[VocabularyEntry]:
+        """Phiên bản async của lookup_vocabulary"""
+        if self._vocab_index is None:
+            # Lần đầu phải đọc database, không chạy ORM trong event loop
+            return await asyncio.to_thread(self.lookup_vocabulary, text)
+        return self._vocab_index.get(text.strip())
 
     def translate(self, text: str) -> str:
         """
@@ -176,106 +579,326 @@ class ChineseAIEngine:
         Returns:
             Kết quả dịch và giải thích
         """
-        try:
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": text},
-            ]
+        # Chuỗi rỗng / chỉ có dấu câu thì không cần gọi API
+        text = text.strip()
+        invalid = _check_input(text)
+        if invalid:
+            return invalid
+
+        # Câu đã dịch trước đó thì trả về ngay, không gọi API
+        cache_key = self._cache_key(text)
+        cache_version = cache.get_or_set(_CACHE_VERSION_KEY, 1, None)
+        cached = cache.get(cache_key, version=cache_version)
+        if cached is not None:
+            logger.info("✓ Cache hit: %s", text)
+            return cached
+
+        # Từ đã có trong kho thì trả lời ngay, không gọi API
+        entry = self.lookup_vocabulary(text)
+        if entry is not None:
+            logger.info("✓ Vocabulary hit: %s", text)
+            return entry.to_explanation()
 
-            logger.info(f"→ Translating: {text}")
+        try:
+            result = self._translate_uncached(text)
+        except TranslationTruncatedError as e:
+            logger.error("✗ Translation truncated: %s", e)
+            return TRUNCATED_MESSAGE
+        except Exception as e:
+            logger.error("✗ Translation error: %s", e)
+            return f"✗ Lỗi kết nối OpenAI: {str(e)}"
 
-            # Gọi AI lần 1
-            response = self.client.chat.completions.create(
-                model=self.config.model,
-                messages=messages,
-                tools=self.tools_schema,
-                tool_choice="auto",
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-            )
+        cache.set(cache_key, result, TRANSLATION_CACHE_TIMEOUT, version=cache_version)
+        return result
 
-            message = response.choices[0].message
-
-            # Xử lý tool calls
-            if message.tool_calls:
-                messages.append(message)
-
-                for tool_call in message.tool_calls:
-                    try:
-                        args = json.loads(tool_call.function.arguments)
-
-                        # Gọi function tương ứng
-                        if tool_call.function.name == "save_vocabulary":
-                            result = self.save_vocabulary(
-                                args["chinese"], args["pinyin"], args["vietnamese"]
-                            )
-                        else:
-                            result = f"Unknown function: {tool_call.function.name}"
-
-                        messages.append(
-                            {
-                                "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": result,
-                            }
-                        )
-
-                    except Exception as e:
-                        logger.error(f"✗ Tool execution error: {e}")
-                        messages.append(
-                            {
-                                "role": "tool",
-                                "tool_call_id": tool_call.id,
-                                "content": f"Error: {str(e)}",
-                            }
-                        )
-
-                # Gọi AI lần 2 để tổng hợp kết quả
-                final_response = self.client.chat.completions.create(
-                    model=self.config.model,
-                    messages=messages,
-                    temperature=self.config.temperature,
-                )
+    async def atranslate(self, text: str) -> str:
+        """
+        Phiên bản async của translate, không chiếm thread trong lúc chờ OpenAI
 
-                result = final_response.choices[0].message.content
-                logger.info(f"✓ Translation completed")
-                return result
+        Args:
+            text: Văn bản cần dịch (tiếng Trung hoặc tiếng Việt)
 
-            # Không có tool call, trả về response trực tiếp
-            result = message.content or "Không có kết quả"
-            logger.info(f"✓ Direct response")
-            return result
+        Returns:
+            Kết quả dịch và giải thích
+        """
+        text = text.strip()
+        invalid = _check_input(text)
+        if invalid:
+            return invalid
+
+        cache_key = self._cache_key(text)
+        cache_version = await cache.aget_or_set(_CACHE_VERSION_KEY, 1, None)
+        cached = await cache.aget(cache_key, version=cache_version)
+        if cached is not None:
+            logger.info("✓ Cache hit: %s", text)
+            return cached
+
+        entry = await self.alookup_vocabulary(text)
+        if entry is not None:
+            logger.info("✓ Vocabulary hit: %s", text)
+            return entry.to_explanation()
 
+        try:
+            result = await self._atranslate_uncached(text)
+        except TranslationTruncatedError as e:
+            logger.error("✗ Translation truncated: %s", e)
+            return TRUNCATED_MESSAGE
         except Exception as e:
-            logger.error(f"✗ Translation error: {e}")
+            logger.error("✗ Translation error: %s", e)
             return f"✗ Lỗi kết nối OpenAI: {str(e)}"
 
+        await cache.aset(
+            cache_key, result, TRANSLATION_CACHE_TIMEOUT, version=cache_version
+        )
+        return result
 
-# Backward compatibility với code cũ
-client = None
+    async def astream_translate(self, text: str) -> AsyncIterator[str]:
+        """
+        Dịch và trả về dần phần giải thích trong lúc OpenAI đang sinh kết quả
+
+        Args:
+            text: Văn bản cần dịch (tiếng Trung hoặc tiếng Việt)
+
+        Yields:
+            Từng đoạn của kết quả dịch và giải thích
+        """
+        text = text.strip()
+        invalid = _check_input(text)
+        if invalid:
+            yield invalid
+            return
+
+        cache_key = self._cache_key(text)
+        cache_version = await cache.aget_or_set(_CACHE_VERSION_KEY, 1, None)
+        cached = await cache.aget(cache_key, version=cache_version)
+        if cached is not None:
+            logger.info("✓ Cache hit: %s", text)
+            yield cached
+            return
+
+        entry = await self.alookup_vocabulary(text)
+        if entry is not None:
+            logger.info("✓ Vocabulary hit: %s", text)
+            yield entry.to_explanation()
+            return
+
+        logger.info("→ Streaming translation: %s", text)
+        explanation = _JSONStringFieldStream("explanation")
+
+        try:
+            # Giữ chỗ trong semaphore suốt thời gian stream còn mở
+            async with self._get_api_semaphore():
+                stream = await self.async_client.chat.completions.create(
+                    **self._translate_kwargs(text),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                finish_reason = None
+                async for chunk in stream:
+                    if chunk.usage:
+                        self._log_usage(chunk.usage)
+                    if chunk.choices and chunk.choices[0].finish_reason:
+                        finish_reason = chunk.choices[0].finish_reason
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    piece = explanation.feed(chunk.choices[0].delta.content)
+                    if piece:
+                        yield piece
+
+            if finish_reason == "length":
+                raise TranslationTruncatedError("finish_reason=length")
+            translation = _json_loads(explanation.getvalue())
+        except TranslationTruncatedError as e:
+            logger.error("✗ Translation truncated: %s", e)
+            yield TRUNCATED_MESSAGE
+            return
+        except Exception as e:
+            logger.error("✗ Translation error: %s", e)
+            yield f"✗ Lỗi kết nối OpenAI: {str(e)}"
+            return
+
+        # Stream xong mới có đủ chinese/pinyin/vietnamese để lưu
+        self._save_in_background(translation)
+        await cache.aset(
+            cache_key,
+            translation["explanation"],
+            TRANSLATION_CACHE_TIMEOUT,
+            version=cache_version,
+        )
+        logger.info("✓ Translation completed")
+
+    def _translate_uncached(self, text: str) -> str:
+        """Gọi OpenAI để dịch (lỗi được raise cho translate xử lý)"""
+        logger.info("→ Translating: %s", text)
+
+        response = self.client.chat.completions.create(
+            **self._translate_kwargs(text)
+        )
+        translation = self._parse_translation(response)
+
+        self._save_in_background(translation)
+
+        logger.info("✓ Translation completed")
+        return translation["explanation"]
+
+    async def _atranslate_uncached(self, text: str) -> str:
+        """Phiên bản async của _translate_uncached, đi qua bộ gom request"""
+        logger.info("→ Translating: %s", text)
+
+        # Bộ gom request tự lưu từ vựng cho cả batch
+        translation = await self._get_batcher().submit(text)
+
+        logger.info("✓ Translation completed")
+        return translation["explanation"]
+
+    def _get_batcher(self) -> "_TranslationBatcher":
+        """Bộ gom request của event loop đang chạy"""
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher_loop is not loop:
+            self._batcher = _TranslationBatcher(self)
+            self._batcher_loop = loop
+        return self._batcher
+
+    def _get_api_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore giới hạn số request OpenAI đồng thời của event loop"""
+        loop = asyncio.get_running_loop()
+        if self._api_semaphore is None or self._api_semaphore_loop is not loop:
+            self._api_semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+            self._api_semaphore_loop = loop
+        return self._api_semaphore
+
+    async def _arequest_translation(self, text: str) -> Dict[str, str]:
+        """Gọi OpenAI dịch một câu"""
+        async with self._get_api_semaphore():
+            response = await self.async_client.chat.completions.create(
+                **self._translate_kwargs(text)
+            )
+        return self._parse_translation(response)
+
+    async def _arequest_translations(self, texts: List[str]) -> List[Dict[str, str]]:
+        """
+        Gọi OpenAI một lần để dịch nhiều câu (cùng model), kết quả theo đúng
+        thứ tự
+        """
+        numbered = "\n".join(f"[{i}] {text}" for i, text in enumerate(texts, 1))
+        async with self._get_api_semaphore():
+            response = await self.async_client.chat.completions.create(
+                model=self._model_for(texts[0]),
+                messages=[
+                    self._system_message,
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Dịch lần lượt {len(texts)} câu sau, mỗi câu là một "
+                            f"phần tử của items theo đúng thứ tự:\n{numbered}"
+                        ),
+                    },
+                ],
+                response_format=self.batch_response_format,
+                temperature=self.config.temperature,
+                max_completion_tokens=sum(map(self._max_tokens_for, texts)),
+            )
+
+        items = self._parse_translation(response)["items"]
+        if len(items) != len(texts):
+            raise ValueError(f"AI trả về {len(items)} kết quả cho {len(texts)} câu")
+        return items
+
+    def _model_for(self, text: str) -> str:
+        """Câu ngắn dùng model mặc định, đoạn văn dài dùng long_text_model"""
+        if (
+            self.config.long_text_model
+            and len(text) > self.config.long_text_threshold
+        ):
+            return self.config.long_text_model
+        return self.config.model
+
+    def _max_tokens_for(self, text: str) -> int:
+        """Số token trả về tối đa, đoạn văn dài được nhiều hơn"""
+        if len(text) > self.config.long_text_threshold:
+            return self.config.long_text_max_tokens
+        return self.config.max_tokens
+
+    def _cache_key(self, text: str) -> str:
+        """Khóa cache theo model và nội dung đã chuẩn hóa"""
+        normalized = text.strip().casefold()
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return f"tr:{self._model_for(text)}:{digest}"
+
+    def _translate_kwargs(self, text: str) -> Dict[str, Any]:
+        """Tham số chat.completions.create cho một lần dịch"""
+        return {
+            "model": self._model_for(text),
+            "messages": [
+                self._system_message,
+                {"role": "user", "content": text},
+            ],
+            "response_format": self.response_format,
+            "temperature": self.config.temperature,
+            "max_completion_tokens": self._max_tokens_for(text),
+        }
+
+    def _log_usage(self, usage) -> None:
+        """Ghi log số token, kèm số prompt token được OpenAI cache"""
+        details = usage.prompt_tokens_details
+        cached_tokens = details.cached_tokens if details else 0
+        logger.info(
+            "→ Tokens: prompt=%s (cached=%s), completion=%s",
+            usage.prompt_tokens,
+            cached_tokens,
+            usage.completion_tokens,
+        )
+
+    def _parse_translation(self, response: ChatCompletion) -> Dict[str, str]:
+        """Lấy JSON kết quả dịch từ response"""
+        if response.usage:
+            self._log_usage(response.usage)
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise TranslationTruncatedError("finish_reason=length")
+        message = choice.message
+        if message.refusal:
+            raise ValueError(message.refusal)
+        return _json_loads(message.content)
+
+
+def clear_translation_cache() -> None:
+    """Vô hiệu hóa toàn bộ kết quả dịch đã cache"""
+    try:
+        cache.incr(_CACHE_VERSION_KEY)
+    except ValueError:
+        # Chưa có version (cache trống) thì không có gì để xóa
+        pass
+
+
+# Engine dùng chung trong process, giữ OpenAI client và connection pool
+_DEFAULT_ENGINE: Optional[ChineseAIEngine] = None
+
+
+def get_engine() -> ChineseAIEngine:
+    """Lấy (tạo lười) ChineseAIEngine dùng chung"""
+    global _DEFAULT_ENGINE
+    if _DEFAULT_ENGINE is None:
+        _DEFAULT_ENGINE = ChineseAIEngine()
+        # Chỉ engine dùng chung sống tới lúc tắt; engine khác tự gọi close()
+        atexit.register(_DEFAULT_ENGINE.close)
+    return _DEFAULT_ENGINE
 
 
+# Backward compatibility với code cũ
 def get_openai_client():
-    """[Deprecated] Sử dụng ChineseAIEngine thay thế"""
-    global client
-    if client is None:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if api_key:
-            try:
-                client = OpenAI(api_key=api_key)
-            except Exception as e:
-                logger.error(f"Lỗi khởi tạo OpenAI client: {e}")
-                client = None
-    return client
+    """[Deprecated] Sử dụng get_engine().client thay thế"""
+    engine = get_engine()
+    if not engine.config.api_key:
+        return None
+    return engine.client
 
 
 def luu_tu_vung(tu_moi, pinyin, nghia):
     """[Deprecated] Sử dụng ChineseAIEngine.save_vocabulary thay thế"""
-    engine = ChineseAIEngine()
-    return engine.save_vocabulary(tu_moi, pinyin, nghia)
+    return get_engine().save_vocabulary(tu_moi, pinyin, nghia)
 
 
 def chay_gia_su(cau_hoi):
     """[Deprecated] Sử dụng ChineseAIEngine.translate thay thế"""
-    engine = ChineseAIEngine()
-    return engine.translate(cau_hoi)
+    return get_engine().translate(cau_hoi)
@@ -2,4 +2,13 @@ from django.apps import AppConfig
 
 
 class TranslatorConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
     name = 'translator'
+
+    def ready(self):
+        from .ai_engine import get_engine
+
+        # Tạo sẵn engine và OpenAI client để request đầu tiên không phải chờ
+        engine = get_engine()
+        if engine.config.api_key:
+            engine.client
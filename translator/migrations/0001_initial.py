@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-15 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Vocabulary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chinese', models.CharField(max_length=200, unique=True, verbose_name='Tiếng Trung')),
+                ('pinyin', models.CharField(blank=True, max_length=200, verbose_name='Phiên âm')),
+                ('vietnamese', models.CharField(max_length=500, verbose_name='Nghĩa tiếng Việt')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Từ vựng đã dịch',
+                'verbose_name_plural': 'Từ vựng đã dịch',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
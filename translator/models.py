@@ -1,3 +1,18 @@
 from django.db import models
 
-# Create your models here.
+
+class Vocabulary(models.Model):
+    """Từ vựng được lưu tự động sau mỗi lần dịch"""
+
+    chinese = models.CharField(max_length=200, unique=True, verbose_name="Tiếng Trung")
+    pinyin = models.CharField(max_length=200, blank=True, verbose_name="Phiên âm")
+    vietnamese = models.CharField(max_length=500, verbose_name="Nghĩa tiếng Việt")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Từ vựng đã dịch"
+        verbose_name_plural = "Từ vựng đã dịch"
+
+    def __str__(self):
+        return f"{self.chinese} ({self.pinyin}) : {self.vietnamese}"
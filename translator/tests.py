@@ -1,3 +1,149 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.urls import resolve
+
+from . import ai_engine, views
+from .ai_engine import (
+    TRUNCATED_MESSAGE,
+    AIConfig,
+    ChineseAIEngine,
+    _JSONStringFieldStream,
+    _TranslationBatcher,
+    VocabularyEntry,
+    get_engine,
+)
+
+
+class SmokeTests(SimpleTestCase):
+    def test_chat_url_resolves_to_chat_api(self):
+        match = resolve("/chat/chat/")
+        self.assertIs(match.func.view_class, views.ChatAPI)
+
+    def test_get_engine_returns_shared_engine(self):
+        engine = get_engine()
+        self.assertIsInstance(engine, ChineseAIEngine)
+        self.assertIs(engine, get_engine())
+
+
+class ChatAPITests(SimpleTestCase):
+    async def test_malformed_message_is_rejected(self):
+        for body in ('["你好"]', '{"message": ["你好"]}', '{"message": 1}'):
+            with self.subTest(body=body):
+                response = await self.async_client.post(
+                    "/chat/chat/", body, content_type="application/json"
+                )
+                self.assertEqual(response.status_code, 400)
+
+
+class JSONStringFieldStreamTests(SimpleTestCase):
+    explanation = 'Xin chào 你好 "trích dẫn"\nxuống dòng \\ 😀 é'
+
+    def stream(self, payload, step):
+        extractor = _JSONStringFieldStream("explanation")
+        out = "".join(
+            extractor.feed(payload[i : i + step])
+            for i in range(0, len(payload), step)
+        )
+        return out, extractor.getvalue()
+
+    def test_every_split_point(self):
+        # ensure_ascii=True: tiếng Trung, emoji thành \uXXXX (emoji là cặp surrogate)
+        payload = json.dumps(
+            {"chinese": "你好", "pinyin": "nǐ hǎo", "explanation": self.explanation}
+        )
+        for step in range(1, 14):
+            with self.subTest(step=step):
+                out, raw = self.stream(payload, step)
+                self.assertEqual(out, self.explanation)
+                self.assertEqual(raw, payload)
+
+    def test_split_inside_surrogate_pair(self):
+        payload = '{"explanation": "a\\ud83d\\ude00b"}'
+        extractor = _JSONStringFieldStream("explanation")
+        cut = payload.index("\\ude00") + 3
+        first = extractor.feed(payload[:cut])
+        second = extractor.feed(payload[cut:])
+        self.assertEqual(first, "a")
+        self.assertEqual(first + second, "a😀b")
+
+    def test_ignores_other_fields_and_trailing_data(self):
+        payload = '{"vietnamese": "\\"explanation\\": \\"x", "explanation": "ok"}'
+        out, _ = self.stream(payload, 4)
+        self.assertEqual(out, "ok")
+
+
+class ChatStreamAPITests(SimpleTestCase):
+    async def test_streams_sse_events(self):
+        async def astream_translate(text):
+            yield "你好 "
+            yield "(nǐ hǎo)"
+
+        engine = mock.Mock(astream_translate=astream_translate)
+        with mock.patch.object(views, "get_engine", return_value=engine):
+            response = await self.async_client.post(
+                "/chat/chat/stream/",
+                {"message": "你好"},
+                content_type="application/json",
+            )
+            body = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = body.decode().strip().split("\n\n")
+        self.assertEqual(
+            [json.loads(e.removeprefix("data: "))["delta"] for e in events[:2]],
+            ["你好 ", "(nǐ hǎo)"],
+        )
+        self.assertTrue(events[-1].startswith("event: done"))
+
+
+class TranslateTests(TestCase):
+    def test_truncated_completion_is_reported_as_truncation(self):
+        engine = ChineseAIEngine(AIConfig(api_key="test"))
+        response = mock.MagicMock()
+        response.choices[0].finish_reason = "length"
+        response.choices[0].message.content = '{"chinese": "你'
+        engine._client = mock.Mock()
+        engine._client.chat.completions.create.return_value = response
+
+        self.assertEqual(engine.translate("你好吗"), TRUNCATED_MESSAGE)
+
+
+class TranslationBatcherTests(SimpleTestCase):
+    async def test_batches_are_split_by_model(self):
+        engine = ChineseAIEngine(AIConfig(api_key="test"))
+        short_text, long_text = "你好", "长" * (engine.config.long_text_threshold + 1)
+
+        async def translate_one(text):
+            return {"chinese": text, "model": engine._model_for(text)}
+
+        with mock.patch.object(
+            engine, "_arequest_translation", side_effect=translate_one
+        ), mock.patch.object(
+            engine, "_arequest_translations"
+        ) as translate_many, mock.patch.object(engine, "_save_in_background"):
+            batcher = _TranslationBatcher(engine)
+            short, long = await asyncio.gather(
+                batcher.submit(short_text), batcher.submit(long_text)
+            )
+
+        translate_many.assert_not_called()
+        self.assertEqual(short["model"], engine.config.model)
+        self.assertEqual(long["model"], engine.config.long_text_model)
+
+
+class VocabularyFileTests(SimpleTestCase):
+    def test_file_is_created_on_first_append_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tu_vung.txt"
+            with mock.patch.object(ai_engine, "VOCABULARY_FILE", path):
+                engine = ChineseAIEngine(AIConfig(api_key="test"))
+            self.assertFalse(path.exists())
+
+            engine._append_vocabulary_file(VocabularyEntry("你好", "nǐ hǎo", "xin chào"))
+            engine.close()
+            self.assertEqual(path.read_text("utf-8"), "你好 (nǐ hǎo) : xin chào\n")
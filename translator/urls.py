@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import ChatAPI, home
+from .views import ChatAPI, ChatStreamAPI, clear_cache, home
 
 urlpatterns = [
     path('', home, name='home'),
     path('chat/', ChatAPI.as_view()),
+    path('chat/stream/', ChatStreamAPI.as_view()),
+    path('cache/clear/', clear_cache, name='clear_translation_cache'),
 ]
\ No newline at end of file
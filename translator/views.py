@@ -1,23 +1,74 @@
+import json
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from .ai_engine import chay_gia_su  # Import hàm AI của bạn
+from .ai_engine import clear_translation_cache, get_engine
 
 
 def home(request):
     return render(request, "index.html")
 
 
+def _get_message(request):
+    """Lấy câu cần dịch từ body JSON hoặc form, None nếu không hợp lệ"""
+    try:
+        data = json.loads(request.body or b"{}")
+    except json.JSONDecodeError:
+        data = request.POST
+    if not isinstance(data, dict):
+        return None
+    message = data.get("message")
+    return message if isinstance(message, str) else None
+
+
+async def _sse_events(chunks):
+    """Đóng gói từng đoạn kết quả thành sự kiện Server-Sent Events"""
+    async for chunk in chunks:
+        yield f"data: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ChatAPI(View):
+    async def post(self, request):
+        text = _get_message(request)
+        if not text:
+            return JsonResponse({"error": "No message"}, status=400)
+
+        # Gọi con Bot xịn xò của bạn (không chặn thread khi chờ OpenAI)
+        reply = await get_engine().atranslate(text)
+
+        return JsonResponse({"reply": reply})
+
+
 @method_decorator(csrf_exempt, name="dispatch")
-class ChatAPI(APIView):
-    def post(self, request):
-        text = request.data.get("message")
+class ChatStreamAPI(View):
+    """
+    Như ChatAPI nhưng gửi kết quả dần dần trong lúc AI đang trả lời
+
+    Cần chạy ASGI (daphne/asgi.py); dưới WSGI Django đọc hết stream rồi mới gửi
+    """
+
+    async def post(self, request):
+        text = _get_message(request)
         if not text:
-            return Response({"error": "No message"}, status=400)
+            return JsonResponse({"error": "No message"}, status=400)
+
+        return StreamingHttpResponse(
+            _sse_events(get_engine().astream_translate(text)),
+            content_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
-        # Gọi con Bot xịn xò của bạn
-        reply = chay_gia_su(text)
 
-        return Response({"reply": reply})
+@staff_member_required
+@require_POST
+def clear_cache(request):
+    """Xóa cache kết quả dịch (chỉ dành cho admin)"""
+    clear_translation_cache()
+    return JsonResponse({"cleared": True})